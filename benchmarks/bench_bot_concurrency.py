@@ -0,0 +1,128 @@
+"""
+Load test of the bot command handlers: hundreds of users send /check while
+a few /notify commands hit an SQLite file locked by another writer, with
+the database calls run inline on the event loop versus on the bounded
+thread pool.
+
+Usage:
+    python -m benchmarks.bench_bot_concurrency [--users N ...] [--lock-seconds S]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+
+class FakeMessage:
+    def __init__(self, latencies, sent_at):
+        self.latencies = latencies
+        self.sent_at = sent_at
+
+    async def reply_text(self, text, **kwargs):
+        self.latencies.append(time.perf_counter() - self.sent_at)
+
+
+class FakeUpdate:
+    def __init__(self, chat_id, message):
+        self.effective_chat = type('Chat', (), {'id': chat_id})()
+        self.message = message
+
+
+class FakeContext:
+    def __init__(self, args):
+        self.args = args
+
+
+def hold_write_lock(path, seconds, started):
+    """Keep the database write-locked from another connection"""
+    connection = sqlite3.connect(path, isolation_level=None)
+    connection.execute('BEGIN IMMEDIATE')
+    started.set()
+    time.sleep(seconds)
+    connection.execute('COMMIT')
+    connection.close()
+
+
+async def run_load(bot, users, notifies, rng, keys):
+    """
+    Send every command at once.
+
+    Returns:
+        tuple: (/check latencies, /notify latencies, total seconds)
+    """
+    check_latencies = []
+    notify_latencies = []
+    start = time.perf_counter()
+
+    # Notifies first, so when run inline they block the loop before the checks
+    calls = []
+    for user in range(notifies):
+        day, hour = rng.choice(keys)
+        message = FakeMessage(notify_latencies, start)
+        calls.append(bot.notify_command(FakeUpdate(users + user, message), FakeContext([day[:5], hour])))
+    for user in range(users):
+        day, hour = rng.choice(keys)
+        message = FakeMessage(check_latencies, start)
+        calls.append(bot.check_command(FakeUpdate(user, message), FakeContext([day[:5], hour])))
+
+    await asyncio.gather(*calls)
+    return check_latencies, notify_latencies, time.perf_counter() - start
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, nargs='+', default=[50, 200, 500])
+    parser.add_argument('--notifies', type=int, default=3)
+    parser.add_argument('--lock-seconds', type=float, default=0.3,
+                        help='how long another writer holds the database lock')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        from benchmarks.run import configure_offline
+        configure_offline(directory)
+
+        from benchmarks.generators import HOURS, make_days, make_snapshot
+        from src.database.operations.available_slots_manager import available_slots_manager
+        from src.db_executor import db_executor
+        from src.telegram_bot import get_telegram_bot
+
+        rng = random.Random(42)
+        days = make_days()
+        available_slots_manager.save_slots(make_snapshot(days, rng))
+        keys = [(day, hour) for day in days for hour in HOURS]
+        bot = get_telegram_bot()
+        pool_workers = db_executor.max_workers or 4
+
+        print(f"{args.notifies} /notify against a write lock held {args.lock_seconds:g}s, plus N /check")
+        print(f"{'mode':<8} {'users':>6} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'total s':>8}")
+        for users in args.users:
+            for mode, workers in (('inline', 0), ('pool', pool_workers)):
+                db_executor.max_workers = workers
+                started = threading.Event()
+                locker = threading.Thread(
+                    target=hold_write_lock,
+                    args=(os.environ['DATABASE_PATH'], args.lock_seconds, started)
+                )
+                locker.start()
+                started.wait()
+
+                checks, _, total = asyncio.run(run_load(bot, users, args.notifies, rng, keys))
+                locker.join()
+                print(f"{mode:<8} {users:>6} {statistics.median(checks) * 1000:9.1f} "
+                      f"{percentile(checks, 0.99) * 1000:9.1f} {max(checks) * 1000:9.1f} {total:8.2f}")
+
+        db_executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
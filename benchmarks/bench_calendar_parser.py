@@ -0,0 +1,69 @@
+"""
+Benchmark the single-pass calendar parser against the previous
+find_previous based extraction.
+
+Usage:
+    python -m benchmarks.bench_calendar_parser [--courts N] [--repeat N]
+"""
+import argparse
+import timeit
+
+from bs4 import BeautifulSoup
+
+from src.calendar_parser import (
+    CELL_CLASS, COURT_CELL_CLASS, COURT_NAME_CLASS, COURT_ATTRIBUTES_CLASS,
+    default_backend, parse_calendar
+)
+from benchmarks.generators import load_fixture, scale_calendar
+
+DAY = '18/10/2026'
+
+
+def legacy_parse(html, day):
+    """Extraction loop as it was in PadelScraper.get_available_slots"""
+    soup = BeautifulSoup(html, 'html.parser')
+    available_slots = []
+    for slot in soup.find_all('span', {'class': CELL_CLASS}):
+        if 'available' in slot.get('class', []):
+            slot_time = slot.get('data-cy', '').replace('slot-', '')
+            court_div = slot.find_previous('div', {'class': COURT_CELL_CLASS})
+            if court_div:
+                available_slots.append({
+                    'day': day,
+                    'hour': slot_time,
+                    'court': court_div.find('span', {'class': COURT_NAME_CLASS}).text,
+                    'attributes': court_div.find('div', {'class': COURT_ATTRIBUTES_CLASS}).text
+                })
+    return available_slots
+
+
+def run(courts, repeat):
+    html = scale_calendar(load_fixture(), courts)
+    expected = legacy_parse(html, DAY)
+
+    candidates = [('legacy find_previous', lambda: legacy_parse(html, DAY)),
+                  ('single pass bs4', lambda: parse_calendar(html, DAY, backend='bs4'))]
+    if default_backend() == 'selectolax':
+        candidates.append(('single pass selectolax', lambda: parse_calendar(html, DAY, backend='selectolax')))
+
+    print(f"Calendar: {courts} courts, {len(html) // 1024} KiB, {len(expected)} available slots")
+    baseline = None
+    for name, func in candidates:
+        assert func() == expected, f"{name} returned different slots"
+        seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+        baseline = baseline or seconds
+        print(f"  {name:<24} {seconds * 1000:9.2f} ms  x{baseline / seconds:6.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--courts', type=int, nargs='+', default=[6, 24, 96])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for courts in args.courts:
+        run(courts, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
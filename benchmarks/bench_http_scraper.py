@@ -0,0 +1,121 @@
+"""
+Serve a recorded calendar API response from a local stand-in server and
+check the HTTP engine end to end: the JSON to slot mapping, the pooled
+fetch of 5 days, and the fallback to the Selenium engine when the API is
+not configured, fails or answers garbage.
+
+Usage:
+    python -m benchmarks.bench_http_scraper [--repeat N]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from benchmarks.generators import FIXTURES_DIR
+
+# Records the fixture must map to, for any requested day
+EXPECTED = [
+    ('18:00', 'Cancha 1', 'Pared - Sintético - Techada'),
+    ('19:30', 'Cancha 1', 'Pared - Sintético - Techada'),
+    ('20:00', 'Cancha 2', 'Blindex - Sintético - Descubierta'),
+]
+
+
+class CalendarAPI(BaseHTTPRequestHandler):
+    """Stand-in for the booking backend: /availability, /missing and /garbage"""
+
+    with open(os.path.join(FIXTURES_DIR, 'availability_day.json'), 'rb') as f:
+        recorded = f.read()
+    requested_dates = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/availability':
+            self.requested_dates.append(parse_qs(url.query)['date'][0])
+            status, body = 200, self.recorded
+        elif url.path == '/garbage':
+            status, body = 200, b'<html>maintenance</html>'
+        else:
+            status, body = 404, b'{"error": "not found"}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def check_mapping(base_url):
+    from src.http_scraper import HttpCalendarScraper
+
+    CalendarAPI.requested_dates.clear()
+    slots = HttpCalendarScraper(api_url=f'{base_url}/availability').get_available_slots(days=5)
+
+    days = [datetime.now() + timedelta(days=offset) for offset in range(5)]
+    assert CalendarAPI.requested_dates == [day.strftime('%Y-%m-%d') for day in days]
+    expected = [
+        {'day': day.strftime('%d/%m/%Y'), 'hour': hour, 'court': court, 'attributes': attributes}
+        for day in days for hour, court, attributes in EXPECTED
+    ]
+    assert slots == expected, f"unexpected records: {slots[:3]}"
+    print(f"mapping: {len(slots)} records over 5 days as expected")
+
+
+def check_fallback(base_url):
+    """PadelScraper with the http engine must fall back to a (fake) browser scrape"""
+    from benchmarks.fake_driver import FakeDriver
+    from benchmarks.generators import load_fixture
+    from src.calendar_parser import parse_calendar
+    from src.driver_pool import DriverPool
+    from src.scraper import PadelScraper
+    from src.venues import Venue
+
+    html = load_fixture()
+    for label, api_url in (('no API URL', ''), ('HTTP 404', f'{base_url}/missing'),
+                           ('invalid JSON', f'{base_url}/garbage')):
+        venue = Venue('bench', 'http://calendar.invalid', api_url=api_url)
+        started = []
+        pool = DriverPool(factory=lambda: started.append(1) or FakeDriver(html, venue.selectors))
+        slots = asyncio.run(PadelScraper(venue=venue, pool=pool, engine='http').check_availability())
+        assert started, f"{label}: the Selenium engine was not used"
+        assert len(slots) == 5 * len(parse_calendar(html, '18/10/2026')), f"{label}: wrong fallback slots"
+        print(f"fallback on {label}: {len(slots)} slots from the Selenium engine")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CalendarAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+
+    with tempfile.TemporaryDirectory() as directory:
+        from benchmarks.run import configure_offline
+        configure_offline(directory)
+
+        check_mapping(base_url)
+        check_fallback(base_url)
+
+        from src.http_scraper import HttpCalendarScraper
+        scraper = HttpCalendarScraper(api_url=f'{base_url}/availability')
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            scraper.get_available_slots(days=5)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        print(f"5-day fetch over the pooled session: {elapsed * 1000:.1f} ms")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Load the saved calendar fixtures into headless Chrome and check that the
+in-browser extraction returns exactly what the Python parser finds in the
+page source, then compare their cost per day. Needs Chrome and ChromeDriver.
+
+Usage:
+    python -m benchmarks.bench_js_extraction [--courts N ...] [--repeat N]
+"""
+import argparse
+import os
+import tempfile
+import timeit
+
+from src.calendar_parser import parse_calendar
+from src.driver_pool import create_driver
+from src.js_extraction import extract_slots
+from src.resource_blocking import get_block_profile
+from benchmarks.generators import load_fixture, scale_calendar
+
+DAY = '18/10/2026'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--courts', type=int, nargs='+', default=[6, 24, 96])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    driver = create_driver(get_block_profile('off'))
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for courts in args.courts:
+                path = os.path.join(directory, f'calendar_{courts}.html')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(scale_calendar(load_fixture(), courts))
+                driver.get(f'file://{path}')
+
+                # Both paths read the same rendered DOM
+                expected = parse_calendar(driver.page_source, DAY)
+                extracted = extract_slots(driver, DAY)
+                assert extracted == expected, (
+                    f"{courts} courts: js extraction returned {len(extracted)} slots, "
+                    f"the parser {len(expected)}"
+                )
+
+                html_seconds = min(timeit.repeat(
+                    lambda: parse_calendar(driver.page_source, DAY), number=1, repeat=args.repeat
+                ))
+                js_seconds = min(timeit.repeat(
+                    lambda: extract_slots(driver, DAY), number=1, repeat=args.repeat
+                ))
+                print(f"{courts:>4} courts, {len(expected):>4} slots: identical, "
+                      f"page_source + parse {html_seconds * 1000:7.2f} ms, "
+                      f"js {js_seconds * 1000:7.2f} ms  x{html_seconds / js_seconds:5.1f}")
+    finally:
+        driver.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark the cost of the log calls of the check_subscriptions loop, as
+seen by the task: the former synchronous DEBUG handlers versus level
+filtering and the queue with its background writer thread.
+
+Usage:
+    python -m benchmarks.bench_logging [--subscriptions N]
+"""
+import argparse
+import contextlib
+import logging
+import os
+import random
+import tempfile
+import time
+
+from src.logger import LoggingPipeline
+from benchmarks.generators import make_days, make_subscriptions
+
+# (label, level, format, queue, f-string messages as before the lazy arguments)
+MODES = [
+    ('sync DEBUG (before)', 'DEBUG', 'text', False, True),
+    ('sync INFO', 'INFO', 'text', False, False),
+    ('queue INFO', 'INFO', 'text', True, False),
+    ('queue DEBUG', 'DEBUG', 'text', True, False),
+    ('queue DEBUG json', 'DEBUG', 'json', True, False),
+]
+
+
+def subscription_loop(logger, subscriptions, eager):
+    """The two debug calls made per subscription by check_subscriptions"""
+    for subscription in subscriptions:
+        if eager:
+            logger.debug(f"Processing subscription: day={subscription.day}, hour={subscription.hour}, chat_id={subscription.chat_id}")
+            logger.debug(f"No slots available for {subscription.day} {subscription.hour}")
+        else:
+            logger.debug("Processing subscription: day=%s, hour=%s, chat_id=%s",
+                         subscription.day, subscription.hour, subscription.chat_id)
+            logger.debug("No slots available for %s %s", subscription.day, subscription.hour)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--subscriptions', type=int, default=20000)
+    args = parser.parse_args()
+
+    subscriptions = make_subscriptions(args.subscriptions, make_days(), random.Random(42))
+    calls = 2 * len(subscriptions)
+
+    print(f"{calls} log calls from a loop over {len(subscriptions)} subscriptions (console to /dev/null)")
+    print(f"{'mode':<22} {'ns/call':>9} {'loop ms':>9} {'drain ms':>9} {'dropped':>8}")
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull:
+        for label, level, fmt, use_queue, eager in MODES:
+            # The console handler binds sys.stdout when the pipeline is configured
+            with contextlib.redirect_stdout(devnull):
+                pipeline = LoggingPipeline()
+                pipeline.configure(level, fmt, os.path.join(directory, label.replace(' ', '_')),
+                                   use_queue, queue_size=calls)
+                logger = logging.getLogger(f'bench.{label}')
+                logger.propagate = False
+                pipeline.attach(logger)
+
+                start = time.perf_counter()
+                subscription_loop(logger, subscriptions, eager)
+                loop = time.perf_counter() - start
+
+                # Time for the listener to write what the loop queued
+                pipeline.flush()
+                drain = time.perf_counter() - start - loop
+                dropped = pipeline.handlers[0].dropped if use_queue else 0
+                pipeline.stop()
+
+            print(f"{label:<22} {loop / calls * 1e9:9.0f} {loop * 1000:9.1f} {drain * 1000:9.1f} {dropped:8d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Run the notification dispatcher against a local fake Bot API server and
+check every delivery outcome: sent, flood control retried, rejected by
+Telegram, and broken responses that must not stop the senders. Reports
+throughput and the queue depth left after the flush.
+
+Usage:
+    python -m benchmarks.bench_notification_dispatcher [--messages N] [--chats N]
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+# Chats with a scripted answer, every other chat is accepted
+CHAT_NOT_FOUND = '-100'
+FLOODED = '-200'
+BROKEN = '-300'
+
+
+class FakeBotAPI(BaseHTTPRequestHandler):
+    """Answers sendMessage like the Bot API, scripted per chat ID"""
+
+    flooded = set()
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _params(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode()
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            return json.loads(body)
+        return {key: values[0] for key, values in parse_qs(body).items()}
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        params = self._params()
+        chat_id = str(params.get('chat_id'))
+        if not self.path.endswith('/sendMessage'):
+            self._reply(404, {'ok': False, 'error_code': 404, 'description': 'Not Found'})
+        elif chat_id == CHAT_NOT_FOUND:
+            self._reply(400, {'ok': False, 'error_code': 400, 'description': 'Bad Request: chat not found'})
+        elif chat_id == FLOODED and chat_id not in self.flooded:
+            with self.lock:
+                self.flooded.add(chat_id)
+            self._reply(429, {'ok': False, 'error_code': 429, 'description': 'Too Many Requests: retry after 1',
+                              'parameters': {'retry_after': 1}})
+        elif chat_id == BROKEN:
+            # Accepted but unparsable, the client raises a non-Telegram error
+            self._reply(200, {'ok': True, 'result': {}})
+        else:
+            self._reply(200, {'ok': True, 'result': {
+                'message_id': 1, 'date': int(time.time()),
+                'chat': {'id': int(chat_id), 'type': 'private'}, 'text': params.get('text', ''),
+            }})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=500)
+    parser.add_argument('--chats', type=int, default=250)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeBotAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    from src.notification_dispatcher import NotificationDispatcher
+
+    dispatcher = NotificationDispatcher(
+        token='1:fake', base_url=f'http://127.0.0.1:{server.server_port}/bot',
+        global_rate=1000, chat_rate=100, concurrency=args.concurrency, max_retries=2
+    )
+    results = {}
+    lock = threading.Lock()
+
+    def recorder(chat_id):
+        def on_result(sent):
+            with lock:
+                results.setdefault(chat_id, []).append(sent)
+        return on_result
+
+    # More broken answers than senders: the senders must survive all of them
+    scripted = [CHAT_NOT_FOUND, FLOODED] + [BROKEN] * (args.concurrency * 2)
+    start = time.perf_counter()
+    for chat_id in scripted:
+        dispatcher.submit(chat_id, 'scripted', recorder(chat_id))
+    for i in range(args.messages):
+        chat_id = str(1000 + i % args.chats)
+        dispatcher.submit(chat_id, f'message {i}', recorder(chat_id))
+
+    flushed = dispatcher.flush(timeout=60)
+    elapsed = time.perf_counter() - start
+    stats = dispatcher.stats()
+    server.shutdown()
+
+    assert flushed, "dispatcher did not flush"
+    assert results[CHAT_NOT_FOUND] == [False], "chat not found must be reported as failed"
+    assert results[FLOODED] == [True], "flood control must be retried"
+    assert results[BROKEN] == [False] * len(scripted[2:]), "broken answers must be reported as failed"
+    delivered = sum(sent for chat_id, outcomes in results.items() if int(chat_id) >= 1000 for sent in outcomes)
+    assert delivered == args.messages, f"only {delivered} of {args.messages} messages delivered"
+    assert stats['queue_depth'] == 0
+
+    print(f"{stats['submitted']} messages: {stats['sent']} sent, {stats['failed']} failed, "
+          f"{stats['retried']} retried, queue depth {stats['queue_depth']}")
+    print(f"{stats['sent'] / elapsed:.0f} msg/s with {args.concurrency} senders, all outcomes as expected")
+
+
+if __name__ == '__main__':
+    main()
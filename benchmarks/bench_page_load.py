@@ -0,0 +1,58 @@
+"""
+Compare page load time and bytes transferred per block profile on a real
+venue page. Unlike the other benchmarks this one needs Chrome, ChromeDriver
+and network access.
+
+Usage:
+    python -m benchmarks.bench_page_load [--venue SLUG] [--profiles off light ...] [--loads N]
+"""
+import argparse
+import statistics
+import time
+
+from src.driver_pool import create_driver
+from src.page_readiness import PageReadiness
+from src.resource_blocking import BLOCK_PROFILES, get_block_profile, reset_network_log, page_stats
+from src.venues import get_venue
+from src.database.models.available_slots_model import DEFAULT_VENUE
+
+
+def load_once(driver, venue):
+    readiness = PageReadiness(
+        driver, cell_class=venue.selectors['cell'], date_label_selector=venue.selectors['date_label']
+    )
+    reset_network_log(driver)
+    start = time.perf_counter()
+    driver.get(venue.url)
+    readiness.wait_for_calendar()
+    elapsed = time.perf_counter() - start
+    return elapsed, page_stats(driver)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--venue', default=DEFAULT_VENUE)
+    parser.add_argument('--profiles', nargs='+', choices=sorted(BLOCK_PROFILES), default=['off', 'light', 'aggressive'])
+    parser.add_argument('--loads', type=int, default=5)
+    args = parser.parse_args()
+
+    venue = get_venue(args.venue)
+    print(f"{venue.url}, median of {args.loads} loads")
+    print(f"{'profile':<12} {'calendar s':>10} {'DCL ms':>8} {'KiB':>8} {'requests':>9} {'blocked':>8}")
+    for name in args.profiles:
+        driver = create_driver(get_block_profile(name))
+        try:
+            loads = [load_once(driver, venue) for _ in range(args.loads)]
+        finally:
+            driver.quit()
+
+        stats = [stats for _, stats in loads]
+        print(f"{name:<12} {statistics.median(seconds for seconds, _ in loads):10.2f} "
+              f"{statistics.median(s['dom_content_loaded_ms'] for s in stats):8.0f} "
+              f"{statistics.median(s['bytes'] for s in stats) / 1024:8.0f} "
+              f"{statistics.median(s['requests'] for s in stats):9.0f} "
+              f"{statistics.median(s['blocked'] for s in stats):8.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark the storage used by a month of slot history at the scrape rate,
+versus keeping a full copy of every snapshot in SQLite.
+
+Usage:
+    python -m benchmarks.bench_slot_history [--interval MINUTES --days N ...]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from src.config import CHECK_INTERVAL
+from src.slot_history import SlotHistory
+from benchmarks.generators import HOURS, COURTS
+
+# Days shown by the calendar
+VISIBLE_DAYS = 5
+
+
+def simulate(start, scrapes, interval, churn, rng):
+    """
+    Simulate consecutive scrapes of one venue.
+
+    Yields:
+        tuple: (timestamp, snapshot set, {'added', 'removed'} changes)
+    """
+    snapshot = set()
+    for index in range(scrapes):
+        now = start + timedelta(minutes=index * interval)
+        days = [(now + timedelta(days=offset)).strftime('%d/%m/%Y') for offset in range(VISIBLE_DAYS)]
+        current = {key for key in snapshot if key[0] in days}
+
+        # Slots on new days start half available, the rest flip with the churn rate
+        known_days = {key[0] for key in snapshot}
+        for day in days:
+            for hour in HOURS:
+                for court in COURTS:
+                    key = (day, hour, court)
+                    if day not in known_days:
+                        if rng.random() < 0.5:
+                            current.add(key)
+                    elif rng.random() < churn:
+                        current.symmetric_difference_update({key})
+
+        changes = {
+            'added': [dict(zip(('day', 'hour', 'court'), key)) for key in current - snapshot],
+            'removed': [dict(zip(('day', 'hour', 'court'), key)) for key in snapshot - current],
+        }
+        snapshot = current
+        yield int(now.timestamp()), snapshot, changes
+
+
+def snapshot_bytes(path, snapshots):
+    """SQLite file size when every snapshot is kept as rows"""
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE snapshots (id INTEGER PRIMARY KEY, scraped_at INTEGER, "
+        "day DATE, hour TIME, court VARCHAR, attributes VARCHAR)"
+    )
+    for timestamp, snapshot in snapshots:
+        connection.executemany(
+            "INSERT INTO snapshots (scraped_at, day, hour, court, attributes) VALUES (?, ?, ?, ?, ?)",
+            [(timestamp, day, hour, court, 'Techada | Cristal') for day, hour, court in snapshot]
+        )
+    connection.commit()
+    connection.close()
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--interval', type=float, default=CHECK_INTERVAL, help='minutes between scrapes')
+    parser.add_argument('--days', type=int, default=30, help='simulated days')
+    parser.add_argument('--churn', type=float, default=0.002, help='probability a slot flips per scrape')
+    parser.add_argument('--snapshot-sample', type=int, default=200,
+                        help='snapshots written to SQLite, extrapolated to the whole period')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    scrapes = int(args.days * 24 * 60 / args.interval)
+    start = datetime(2026, 1, 1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        history = SlotHistory(os.path.join(directory, 'history'))
+        sample = []
+        events = 0
+        append_time = 0.0
+
+        for timestamp, snapshot, changes in simulate(start, scrapes, args.interval, args.churn, rng):
+            if len(sample) < args.snapshot_sample:
+                sample.append((timestamp, snapshot))
+            events += len(changes['added']) + len(changes['removed'])
+            began = time.perf_counter()
+            history.append('default', changes, timestamp)
+            append_time += time.perf_counter() - began
+
+        live = history.size()
+        history.compact(now=start + timedelta(days=args.days + 31))
+        compacted = history.size()
+
+        began = time.perf_counter()
+        profile = history.free_up_profile('18:00', court=COURTS[0])
+        query_time = time.perf_counter() - began
+
+        sampled = snapshot_bytes(os.path.join(directory, 'snapshots.db'), sample)
+        full_snapshots = sampled * scrapes / len(sample)
+
+    print(f"{scrapes} scrapes every {args.interval:g} min over {args.days} days, {events} events")
+    print(f"  history live segment    {live / 1024:10.1f} KiB  ({append_time / scrapes * 1000:.2f} ms per append)")
+    print(f"  history compacted       {compacted / 1024:10.1f} KiB  ({compacted / max(events, 1):.2f} bytes per event)")
+    print(f"  full snapshots (SQLite) {full_snapshots / 1024:10.1f} KiB  (extrapolated from {len(sample)} snapshots)")
+    print(f"  ratio                   x{full_snapshots / compacted:9.0f}")
+    print(f"  free-up query over the period {query_time * 1000:.0f} ms, {profile['openings']} openings of 18:00 "
+          f"on {COURTS[0]}, median lead {profile['median_lead_hours'] or 0:.1f} h")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark worker boot and per-task setup: the time to import the Celery
+tasks and the bot entry point in a fresh interpreter, and the cost of
+getting a Telegram client and a scraper inside a task.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+IMPORTS = [
+    ('import src', 'import src'),
+    ('worker boot (import src.tasks)', 'import src.tasks'),
+    ('bot boot (import src.main)', 'import src.main'),
+]
+
+# Measured in a fresh interpreter after `import src.tasks`, 20 iterations
+TASK_SETUP = '''
+import time
+import src.tasks
+from src.telegram_bot import get_telegram_bot
+from src.scraper import PadelScraper
+start = time.perf_counter()
+for _ in range(20):
+    get_telegram_bot().create_message([])
+    PadelScraper()
+print((time.perf_counter() - start) / 20)
+'''
+
+
+def run_python(code, env):
+    result = subprocess.run(
+        [sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+
+def time_import(statement, env):
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    return float(run_python(code, env).strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            'DATABASE_PATH': os.path.join(directory, 'bench.db'),
+            'REDIS_URL': 'redis://127.0.0.1:1/0',
+            'TELEGRAM_BOT_TOKEN': os.getenv('TELEGRAM_BOT_TOKEN', '123456:offline-benchmark'),
+        }
+
+        print(f"Median of {args.repeat} fresh interpreters")
+        for name, statement in IMPORTS:
+            seconds = statistics.median(time_import(statement, env) for _ in range(args.repeat))
+            print(f"  {name:<34} {seconds * 1000:8.1f} ms")
+
+        seconds = statistics.median(
+            float(run_python(TASK_SETUP, env).strip().splitlines()[-1]) for _ in range(args.repeat)
+        )
+        print(f"  {'per-task bot and scraper setup':<34} {seconds * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
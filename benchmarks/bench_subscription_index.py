@@ -0,0 +1,67 @@
+"""
+Benchmark matching a batch of new slots against subscriptions with the
+interval index versus the per-subscription strptime filter.
+
+Usage:
+    python -m benchmarks.bench_subscription_index [--subscriptions N ...]
+"""
+import argparse
+import random
+import time
+
+from src.subscription_index import SubscriptionIndex
+from benchmarks.legacy import filter_slots_by_hour
+from benchmarks.generators import make_days, make_subscriptions, make_slots
+
+
+def naive_match(subscriptions, slots):
+    """Per-subscription scan as done before the index"""
+    slots_by_day = {}
+    for slot in slots:
+        slots_by_day.setdefault(slot['day'], []).append(slot)
+
+    matches = {}
+    for subscription in subscriptions:
+        found = filter_slots_by_hour(slots_by_day.get(subscription.day, []), subscription.hour)
+        if found:
+            matches[subscription] = found
+    return matches
+
+
+def indexed_match(subscriptions, slots):
+    return SubscriptionIndex.from_subscriptions(subscriptions).match_slots(slots)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--subscriptions', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--slots', type=int, default=200)
+    parser.add_argument('--naive-max', type=int, default=10000,
+                        help='skip the naive scan above this many subscriptions')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    days = make_days()
+    slots = make_slots(args.slots, days, rng)
+
+    print(f"Batch of {len(slots)} new slots over {len(days)} days")
+    for count in args.subscriptions:
+        subscriptions = make_subscriptions(count, days, rng)
+        indexed, indexed_time = timed(indexed_match, subscriptions, slots)
+        line = f"  {count:>7} subscriptions  index {indexed_time * 1000:9.1f} ms ({len(indexed)} matched)"
+
+        if count <= args.naive_max:
+            naive, naive_time = timed(naive_match, subscriptions, slots)
+            assert set(naive) == set(indexed), "index and scan matched different subscriptions"
+            line += f"  scan {naive_time * 1000:9.1f} ms  x{naive_time / indexed_time:5.1f}"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark the subscription sweep with recurring rules stored as one row
+each versus the same rules expanded into one subscription per date.
+
+Usage:
+    python -m benchmarks.bench_subscription_rules [--rules N ...] [--range-days D]
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from src.database.formats import format_day
+from src.database.models.subscription_rule_model import SubscriptionRule
+from src.subscription_index import RuleIndex
+from src.subscription_rules import parse_hour_window
+from benchmarks.legacy import filter_slots_by_hour
+from benchmarks.generators import HOURS, Subscription, make_days, make_slots
+
+
+def make_rules(count, range_days, rng):
+    """Rules like "/repeat mar,jue 19:00" over a date range starting today"""
+    today = date.today()
+    rules = []
+    for i in range(count):
+        start_hour, end_hour = parse_hour_window(rng.choice(HOURS))
+        rules.append(SubscriptionRule(
+            id=i,
+            chat_id=str(rng.randrange(count // 2 + 1)),
+            weekdays=(1 << rng.randrange(7)) | (1 << rng.randrange(7)),
+            start_hour=start_hour,
+            end_hour=end_hour,
+            start_date=today,
+            end_date=today + timedelta(days=range_days - 1)
+        ))
+    return rules
+
+
+def expand(rules, range_days):
+    """One subscription per date covered by each rule, as users had to create them"""
+    today = date.today()
+    subscriptions = []
+    for rule in rules:
+        for offset in range(range_days):
+            day = today + timedelta(days=offset)
+            if rule.covers(day):
+                subscriptions.append(Subscription(len(subscriptions), rule.chat_id, format_day(day), rule.start_hour))
+    return subscriptions
+
+
+def expanded_sweep(subscriptions, slots):
+    """Row by row sweep as check_subscriptions does for dated subscriptions"""
+    slots_by_day = {}
+    for slot in slots:
+        slots_by_day.setdefault(slot['day'], []).append(slot)
+
+    matched = set()
+    for subscription in subscriptions:
+        for slot in filter_slots_by_hour(slots_by_day.get(subscription.day, []), subscription.hour):
+            matched.add((subscription.chat_id, slot['fecha'], slot['hora'], slot['cancha']))
+    return matched
+
+
+def rule_sweep(rules, slots):
+    matched = set()
+    for rule, rule_slots in RuleIndex.from_rules(rules).match_slots(slots).items():
+        for slot in rule_slots:
+            matched.add((rule.chat_id, slot['day'], slot['hour'], slot['court']))
+    return matched
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rules', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--range-days', type=int, default=90, help='dates covered by each rule')
+    parser.add_argument('--slots', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    slots = make_slots(args.slots, make_days(), rng)
+
+    print(f"Sweep of {len(slots)} stored slots, rules covering {args.range_days} days")
+    print(f"{'rules':>7} {'rows':>9} {'expanded ms':>12} {'rules ms':>9} {'speedup':>8}")
+    for count in args.rules:
+        rules = make_rules(count, args.range_days, rng)
+        subscriptions = expand(rules, args.range_days)
+
+        expanded, expanded_time = timed(expanded_sweep, subscriptions, slots)
+        matched, rules_time = timed(rule_sweep, rules, slots)
+        assert expanded == matched, "rules and expanded subscriptions matched different slots"
+        print(f"{count:>7} {len(subscriptions):>9} {expanded_time * 1000:12.1f} "
+              f"{rules_time * 1000:9.1f} {expanded_time / rules_time:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Minimal stand-in for a Chrome WebDriver serving a saved calendar, so the
+Selenium scrape loop can be benchmarked offline.
+"""
+from selenium.webdriver.common.by import By
+
+from src.page_readiness import NETWORK_STATE_SCRIPT
+
+
+class FakeElement:
+    def __init__(self, driver, text=''):
+        self.driver = driver
+        self.text = text
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self.driver.next_day()
+
+
+class FakeDriver:
+    """
+    Serves the same calendar HTML for every day, the date label changes on
+    every click of the next day button like on the real page.
+    """
+
+    def __init__(self, html, selectors):
+        self.html = html
+        self.selectors = selectors
+        self.day = 0
+
+    @property
+    def page_source(self):
+        return self.html
+
+    def get(self, url):
+        self.day = 0
+
+    def next_day(self):
+        self.day += 1
+
+    def find_elements(self, by, value):
+        if by == By.CSS_SELECTOR and value == self.selectors['date_label']:
+            return [FakeElement(self, f"day {self.day}")]
+        if by == By.CLASS_NAME and value == self.selectors['cell']:
+            return [FakeElement(self)]
+        return []
+
+    def find_element(self, by, value):
+        return FakeElement(self)
+
+    def get_log(self, log_type):
+        return []
+
+    def execute_script(self, script, *args):
+        if script == NETWORK_STATE_SCRIPT:
+            return ['complete', 1]
+        return None
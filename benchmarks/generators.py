@@ -0,0 +1,87 @@
+"""
+Recorded fixtures and synthetic data shared by the benchmarks.
+"""
+import os
+import re
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+HOURS = [f"{h:02d}:{m:02d}" for h in range(8, 24) for m in (0, 30)]
+COURTS = [f"Cancha {i}" for i in range(1, 7)]
+
+# Shape of the Subscription rows used by the matching code
+Subscription = namedtuple('Subscription', 'id chat_id day hour')
+
+
+def load_fixture(name='calendar_day.html'):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def scale_calendar(html, courts):
+    """
+    Build a larger calendar by repeating the court rows of a saved fixture.
+
+    Args:
+        html (str): Saved calendar HTML
+        courts (int): Number of court rows wanted
+
+    Returns:
+        str: Calendar HTML with `courts` rows
+    """
+    rows = re.findall(r'<div class="CalendarioTurnosstyled__Row-.*?</span>\s*</div></div>', html, re.S)
+    if not rows or courts <= len(rows):
+        return html
+
+    extra = [rows[i % len(rows)] for i in range(courts - len(rows))]
+    last_row = html.rindex(rows[-1]) + len(rows[-1])
+    return html[:last_row] + '\n'.join(extra) + html[last_row:]
+
+
+def make_days(count=5):
+    today = datetime.now()
+    return [(today + timedelta(days=offset)).strftime("%d/%m/%Y") for offset in range(count)]
+
+
+def make_subscriptions(count, days, rng):
+    return [
+        Subscription(i, str(rng.randrange(count // 2 + 1)), rng.choice(days), rng.choice(HOURS))
+        for i in range(count)
+    ]
+
+
+def make_slots(count, days, rng):
+    return [
+        {'day': rng.choice(days), 'hour': rng.choice(HOURS), 'court': rng.choice(COURTS), 'attributes': ''}
+        for _ in range(count)
+    ]
+
+
+def make_snapshot(days, rng, courts=COURTS, availability=0.5):
+    """
+    Build a scraped snapshot without duplicates, as save_slots receives it.
+
+    Returns:
+        list: {'day', 'hour', 'court', 'attributes'} dicts
+    """
+    return [
+        {'day': day, 'hour': hour, 'court': court, 'attributes': 'Techada | Cristal'}
+        for day in days for hour in HOURS for court in courts
+        if rng.random() < availability
+    ]
+
+
+def churn_snapshot(snapshot, days, rng, rate=0.05, courts=COURTS):
+    """
+    Drop and add about `rate` of the slots of a snapshot, like consecutive scrapes.
+    """
+    kept = [slot for slot in snapshot if rng.random() >= rate]
+    taken = {(slot['day'], slot['hour'], slot['court']) for slot in kept}
+    for _ in range(int(len(snapshot) * rate)):
+        key = (rng.choice(days), rng.choice(HOURS), rng.choice(courts))
+        if key not in taken:
+            taken.add(key)
+            kept.append({'day': key[0], 'hour': key[1], 'court': key[2], 'attributes': 'Techada | Cristal'})
+    return kept
@@ -0,0 +1,39 @@
+"""
+Implementations replaced by the optimized code, kept as the baselines the
+benchmarks compare against.
+"""
+from src.database.formats import parse_hour
+from src.database.models.available_slots_model import DEFAULT_VENUE
+from src.database.operations.available_slots_manager import hour_window
+
+
+def filter_slots_by_hour(slots, hour):
+    """
+    Keep the slots that start within the window of a requested hour, the
+    per-subscription scan done before the subscription index.
+
+    Args:
+        slots (list): List of {'day', 'hour', 'court'} dicts
+        hour (str): Hour in format HH:MM
+
+    Returns:
+        list: Matching slots as {'fecha', 'hora', 'cancha', 'sede'} dicts, sorted by hour
+    """
+    target_hour, end_hour = hour_window(hour)
+
+    filtered_slots = []
+    for slot in slots:
+        slot_hour = parse_hour(slot['hour'])
+        # Check if slot is within 3 hours window
+        if target_hour <= slot_hour <= end_hour:
+            filtered_slots.append({
+                'fecha': slot['day'],
+                'hora': slot['hour'],
+                'cancha': slot['court'],
+                'sede': slot.get('venue', DEFAULT_VENUE)
+            })
+
+    # Sort slots by hour
+    filtered_slots.sort(key=lambda x: x['hora'])
+
+    return filtered_slots
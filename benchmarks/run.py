@@ -0,0 +1,233 @@
+"""
+Offline benchmark suite for the scrape, persistence, matching and
+messaging stages. Reports ops/sec and peak memory per stage and compares
+them against a stored baseline.
+
+Usage:
+    python -m benchmarks.run [--stages NAME ...] [--save-baseline] [--check]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def configure_offline(directory):
+    """
+    Point the app at a scratch database and an unreachable Redis before
+    any src module is imported, so nothing leaves the machine.
+    """
+    os.environ['DATABASE_PATH'] = os.path.join(directory, 'bench.db')
+    os.environ['REDIS_URL'] = 'redis://127.0.0.1:1/0'
+    os.environ['HISTORY_DIR'] = os.path.join(directory, 'history')
+    # Nothing loads in the background, readiness waits only need their first polls
+    os.environ['NETWORK_IDLE_TIME'] = '0'
+    os.environ.setdefault('TELEGRAM_BOT_TOKEN', '123456:offline-benchmark')
+
+
+def stage_get_available_slots(rng, courts=24):
+    """Selenium scrape loop over 5 days against a saved calendar (html extraction)"""
+    from benchmarks.fake_driver import FakeDriver
+    from benchmarks.generators import load_fixture, scale_calendar
+    from src.scraper import PadelScraper
+    from src.venues import get_venue
+
+    venue = get_venue()
+    scraper = PadelScraper(venue=venue, extraction_mode='html')
+    scraper.driver = FakeDriver(scale_calendar(load_fixture(), courts), venue.selectors)
+    return scraper.get_available_slots
+
+
+def stage_parse_calendar(rng, courts=96):
+    """Single-pass parse of a generated large calendar"""
+    from benchmarks.generators import load_fixture, scale_calendar
+    from src.calendar_parser import parse_calendar
+
+    html = scale_calendar(load_fixture(), courts)
+    return lambda: parse_calendar(html, '18/10/2026')
+
+
+def stage_save_slots(rng, days=5):
+    """save_slots diff sync of consecutive scrapes with 5% churn"""
+    from benchmarks.generators import make_days, make_snapshot, churn_snapshot
+    from src.database.operations.available_slots_manager import available_slots_manager
+
+    day_list = make_days(days)
+    snapshots = [make_snapshot(day_list, rng)]
+    for _ in range(9):
+        snapshots.append(churn_snapshot(snapshots[-1], day_list, rng))
+    available_slots_manager.save_slots(snapshots[0], 'bench')
+    state = {'index': 0}
+
+    def run():
+        state['index'] = (state['index'] + 1) % len(snapshots)
+        available_slots_manager.save_slots(snapshots[state['index']], 'bench')
+    return run
+
+
+def _lookup_keys(rng, count=200):
+    """Store a 5-day snapshot and pick random (day, hour) lookups over it"""
+    from benchmarks.generators import HOURS, make_days, make_snapshot
+    from src.database.operations.available_slots_manager import available_slots_manager
+
+    day_list = make_days()
+    available_slots_manager.save_slots(make_snapshot(day_list, rng), 'bench')
+    return [(rng.choice(day_list), rng.choice(HOURS)) for _ in range(count)]
+
+
+def stage_lookup_cold(rng):
+    """get_available_slots_by_day_and_hour without cache hits (200 lookups)"""
+    from src.availability_cache import availability_cache
+    from src.database.operations.available_slots_manager import available_slots_manager
+
+    keys = _lookup_keys(rng)
+
+    def run():
+        for day, hour in keys:
+            availability_cache.invalidate()
+            available_slots_manager.get_available_slots_by_day_and_hour(day, hour)
+    return run
+
+
+def stage_lookup_cached(rng):
+    """get_available_slots_by_day_and_hour through the read cache (200 lookups)"""
+    from src.database.operations.available_slots_manager import available_slots_manager
+
+    keys = _lookup_keys(rng)
+
+    def run():
+        for day, hour in keys:
+            available_slots_manager.get_available_slots_by_day_and_hour(day, hour)
+    return run
+
+
+def stage_subscription_match(rng, subscriptions=10000, slots=200):
+    """Index 10k subscriptions and match a batch of 200 new slots"""
+    from benchmarks.generators import make_days, make_subscriptions, make_slots
+    from src.subscription_index import SubscriptionIndex
+
+    day_list = make_days()
+    subscription_list = make_subscriptions(subscriptions, day_list, rng)
+    slot_list = make_slots(slots, day_list, rng)
+    return lambda: SubscriptionIndex.from_subscriptions(subscription_list).match_slots(slot_list)
+
+
+def stage_create_message(rng, messages=100):
+    """TelegramBot.create_message for 100 notifications of 3 slots"""
+    from benchmarks.generators import make_days, make_slots
+    from src.telegram_bot import get_telegram_bot
+
+    bot = get_telegram_bot()
+    batches = [
+        [{'fecha': slot['day'], 'hora': slot['hour'], 'cancha': slot['court']}
+         for slot in make_slots(3, make_days(), rng)]
+        for _ in range(messages)
+    ]
+
+    def run():
+        for batch in batches:
+            bot.create_message(batch)
+    return run
+
+
+STAGES = {
+    'get_available_slots': stage_get_available_slots,
+    'parse_calendar': stage_parse_calendar,
+    'save_slots': stage_save_slots,
+    'lookup_cold': stage_lookup_cold,
+    'lookup_cached': stage_lookup_cached,
+    'subscription_match': stage_subscription_match,
+    'create_message': stage_create_message,
+}
+
+
+def measure(func, min_time, max_ops):
+    """
+    Returns:
+        dict: ops/sec over repeated calls and peak traced memory of one call
+    """
+    func()  # warm up caches and lazy imports
+
+    ops = 0
+    start = time.perf_counter()
+    while ops < max_ops:
+        func()
+        ops += 1
+        if time.perf_counter() - start >= min_time:
+            break
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'ops_per_sec': ops / elapsed, 'ms_per_op': elapsed / ops * 1000, 'peak_kib': peak / 1024}
+
+
+def compare(name, result, baseline, threshold):
+    """
+    Returns:
+        tuple: (comparison text, True if ops/sec dropped more than the threshold)
+    """
+    previous = baseline.get(name)
+    if not previous:
+        return '', False
+    change = result['ops_per_sec'] / previous['ops_per_sec'] - 1
+    memory = result['peak_kib'] - previous['peak_kib']
+    regressed = change < -threshold
+    flag = '  REGRESSION' if regressed else ''
+    return f"  {change:+7.1%} ops/s  {memory:+9.1f} KiB{flag}", regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--stages', nargs='+', choices=sorted(STAGES), default=list(STAGES))
+    parser.add_argument('--min-time', type=float, default=1.0, help='seconds spent per stage')
+    parser.add_argument('--max-ops', type=int, default=10000)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='ops/sec drop reported as a regression (0.2 = 20%%)')
+    parser.add_argument('--check', action='store_true', help='exit with status 1 on regressions')
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    with tempfile.TemporaryDirectory() as directory:
+        configure_offline(directory)
+        print(f"{'stage':<22} {'ops/s':>10} {'ms/op':>10} {'peak KiB':>10}")
+        for name in args.stages:
+            func = STAGES[name](random.Random(42))
+            result = measure(func, args.min_time, args.max_ops)
+            results[name] = result
+            text, regressed = compare(name, result, baseline, args.threshold)
+            if regressed:
+                regressions.append(name)
+            print(f"{name:<22} {result['ops_per_sec']:10.1f} {result['ms_per_op']:10.2f} "
+                  f"{result['peak_kib']:10.1f}{text}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({**baseline, **results}, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,18 @@
 from .config import BASE_URL, CHECK_INTERVAL, ENABLE_NOTIFICATIONS
 from .logger import setup_logger
-from .scraper import PadelScraper
-from .telegram_bot import TelegramBot
\ No newline at end of file
+
+# Heavy modules (Selenium, Telegram) are only imported when first used
+_LAZY_ATTRIBUTES = {
+    'PadelScraper': '.scraper',
+    'TelegramBot': '.telegram_bot',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+
+from src.logger import setup_logger
+from src.config import AVAILABILITY_CACHE_TTL, AVAILABILITY_CACHE_SIZE, AVAILABILITY_VERSION_INTERVAL
+from src.metrics import AVAILABILITY_CACHE_LOOKUPS
+from src.redis_client import get_redis
+
+logger = setup_logger(__name__)
+
+VERSION_KEY = 'padelbot:availability:version'
+
+
+class AvailabilityCache:
+    """
+    Versioned read-through cache of availability lookups.
+
+    Entries live in process and are tagged with the snapshot version they
+    were read at. The version is shared through Redis, so a scrape that
+    persists changes invalidates every process, at the latest after the
+    version interval. Without Redis the version is local to the process and
+    entries expire after the TTL.
+    """
+
+    def __init__(self, ttl=AVAILABILITY_CACHE_TTL, max_entries=AVAILABILITY_CACHE_SIZE,
+                 version_interval=AVAILABILITY_VERSION_INTERVAL):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version_interval = version_interval
+        self._entries = OrderedDict()
+        self._local_version = 0
+        # (version, monotonic time it was read at), saves a Redis GET per lookup
+        self._shared_version = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _version(self):
+        client = get_redis()
+        if client is None:
+            return self._local_version
+
+        now = time.monotonic()
+        shared = self._shared_version
+        if shared is not None and now - shared[1] < self.version_interval:
+            return shared[0]
+        try:
+            version = int(client.get(VERSION_KEY) or 0)
+        except Exception as e:
+            logger.warning(f"Could not read availability version from Redis: {str(e)}")
+            return self._local_version
+        self._shared_version = (version, now)
+        return version
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached value for a key, loading it on a miss.
+
+        Args:
+            key (hashable): Lookup key
+            loader (callable): Called without arguments to read the value
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        version = self._version()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, stored_at, value = entry
+                if entry_version == version and now - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    AVAILABILITY_CACHE_LOOKUPS.labels(result='hit').inc()
+                    return value
+            self.misses += 1
+        AVAILABILITY_CACHE_LOOKUPS.labels(result='miss').inc()
+
+        value = loader()
+
+        with self._lock:
+            self._entries[key] = (version, now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        """
+        Mark every cached lookup as stale, called when a new snapshot is persisted.
+        """
+        with self._lock:
+            self._local_version += 1
+            self._entries.clear()
+            self.invalidations += 1
+
+        client = get_redis()
+        if client is not None:
+            try:
+                # This process sees its own change right away, the others
+                # within the version interval
+                self._shared_version = (client.incr(VERSION_KEY), time.monotonic())
+            except Exception as e:
+                self._shared_version = None
+                logger.warning(f"Could not bump availability version in Redis: {str(e)}")
+
+    def stats(self):
+        """
+        Returns:
+            dict: Hits, misses, hit rate, invalidations and cached entries
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'entries': len(self._entries),
+        }
+
+
+# Create a global instance of AvailabilityCache for this process
+availability_cache = AvailabilityCache()
@@ -0,0 +1,179 @@
+from functools import lru_cache
+
+from src.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+# Parser backends are imported on first parse, not when the worker boots.
+# The faster optional ones are used when installed
+@lru_cache(maxsize=None)
+def _selectolax_parser():
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:
+        return None
+    return LexborHTMLParser
+
+
+@lru_cache(maxsize=None)
+def _bs4_features():
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return 'html.parser'
+    return 'lxml'
+
+# CSS classes of the booking calendar
+CELL_CLASS = 'CalendarioTurnosstyled__Cell-sc-71hh21-2'
+COURT_CELL_CLASS = 'CalendarioTurnosstyled__CourtCell-sc-71hh21-6'
+COURT_NAME_CLASS = 'CalendarioTurnosstyled__CourtName-sc-71hh21-7'
+COURT_ATTRIBUTES_CLASS = 'CalendarioTurnosstyled__CourtAttributes-sc-71hh21-8'
+
+# Date picker: button moving to the next day and text of the displayed day
+NEXT_DAY_CLASS = 'DatePicker___StyledArrowIcon2-sc-aj5dzg-1'
+DATE_LABEL_SELECTOR = "[class*='DatePicker'] span"
+
+# Default calendar classes, venues can override them
+DEFAULT_SELECTORS = {
+    'court_cell': COURT_CELL_CLASS,
+    'court_name': COURT_NAME_CLASS,
+    'court_attributes': COURT_ATTRIBUTES_CLASS,
+    'cell': CELL_CLASS,
+}
+
+# Tag expected for each calendar node, in the order they appear in a row
+NODE_TAGS = {
+    'court_cell': 'div',
+    'court_name': 'span',
+    'court_attributes': 'div',
+    'cell': 'span',
+}
+
+
+def calendar_nodes(selectors=None):
+    """
+    Map every calendar class to the kind of node and the tag it is expected on.
+
+    Args:
+        selectors (dict, optional): Calendar classes by kind, defaults to DEFAULT_SELECTORS
+
+    Returns:
+        dict: class name -> (kind, tag)
+    """
+    selectors = selectors or DEFAULT_SELECTORS
+    return {selectors[kind]: (kind, tag) for kind, tag in NODE_TAGS.items()}
+
+
+def default_backend():
+    """
+    Pick the fastest parser backend available in this environment.
+
+    Returns:
+        str: 'selectolax' or 'bs4'
+    """
+    return 'selectolax' if _selectolax_parser() is not None else 'bs4'
+
+
+class _SlotCollector:
+    """
+    Accumulates slots while the calendar nodes are visited in document order.
+    The court of a slot is the last court cell seen before it.
+    """
+
+    def __init__(self, day):
+        self.day = day
+        self.slots = []
+        self.court = None
+
+    def visit(self, kind, classes, get_text, get_attribute):
+        if kind == 'court_cell':
+            self.court = {'name': None, 'attributes': None}
+        elif kind == 'court_name':
+            if self.court is not None and self.court['name'] is None:
+                self.court['name'] = get_text()
+        elif kind == 'court_attributes':
+            if self.court is not None and self.court['attributes'] is None:
+                self.court['attributes'] = get_text()
+        elif 'available' in classes:
+            slot_time = (get_attribute('data-cy') or '').replace('slot-', '')
+            if self.court is None:
+                logger.warning(f"Could not find court information for slot {slot_time}")
+                return
+
+            self.slots.append({
+                'day': self.day,
+                'hour': slot_time,
+                'court': self.court['name'] or '',
+                'attributes': self.court['attributes'] or ''
+            })
+
+
+def _node_kind(tag_name, classes, nodes):
+    for class_name in classes:
+        node = nodes.get(class_name)
+        if node is not None and node[1] == tag_name:
+            return node[0]
+    return None
+
+
+def _parse_bs4(html, collector, nodes):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, _bs4_features())
+
+    def is_calendar_node(tag):
+        return _node_kind(tag.name, tag.get('class') or (), nodes) is not None
+
+    # A single find_all walks the tree once and yields nodes in document order
+    for tag in soup.find_all(is_calendar_node):
+        classes = tag.get('class') or ()
+        collector.visit(
+            _node_kind(tag.name, classes, nodes),
+            classes,
+            tag.get_text,
+            tag.get
+        )
+
+
+def _parse_selectolax(html, collector, nodes):
+    tree = _selectolax_parser()(html)
+    selector = ', '.join(f'{tag}.{class_name}' for class_name, (_, tag) in nodes.items())
+
+    for node in tree.css(selector):
+        classes = (node.attributes.get('class') or '').split()
+        collector.visit(
+            _node_kind(node.tag, classes, nodes),
+            classes,
+            node.text,
+            node.attributes.get
+        )
+
+
+def parse_calendar(html, day, backend=None, selectors=None):
+    """
+    Extract the available slots of one calendar day in a single pass.
+
+    Args:
+        html (str): Calendar page HTML
+        day (str): Day the calendar shows, in format DD/MM/YYYY
+        backend (str, optional): 'selectolax' or 'bs4', defaults to the fastest installed
+        selectors (dict, optional): Calendar classes by kind, defaults to DEFAULT_SELECTORS
+
+    Returns:
+        list: List of {'day', 'hour', 'court', 'attributes'} dicts
+    """
+    backend = backend or default_backend()
+    nodes = calendar_nodes(selectors)
+    collector = _SlotCollector(day)
+
+    if backend == 'selectolax':
+        if _selectolax_parser() is None:
+            raise ValueError("selectolax backend requested but selectolax is not installed")
+        _parse_selectolax(html, collector, nodes)
+    elif backend == 'bs4':
+        _parse_bs4(html, collector, nodes)
+    else:
+        raise ValueError(f"Unknown calendar parser backend: {backend}")
+
+    return collector.slots
@@ -19,4 +19,99 @@ TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 # Celery configuration
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://redis:6379/0')
-CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://redis:6379/0') 
\ No newline at end of file
+CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://redis:6379/0') 
+
+# ChromeDriver pool configuration (per worker process)
+DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', '1'))
+DRIVER_MAX_USES = int(os.getenv('DRIVER_MAX_USES', '50'))
+
+# Scraping engine: 'selenium' drives a browser, 'http' reads the calendar API
+SCRAPER_ENGINE = os.getenv('SCRAPER_ENGINE', 'selenium').lower()
+
+# Calendar availability endpoint used by the HTTP engine (receives ?date=YYYY-MM-DD)
+CALENDAR_API_URL = os.getenv('CALENDAR_API_URL', '')
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '10'))
+
+# Page readiness waits (in seconds)
+READY_TIMEOUT = float(os.getenv('READY_TIMEOUT', '10'))
+NETWORK_IDLE_TIME = float(os.getenv('NETWORK_IDLE_TIME', '0.5'))
+
+# Slot extraction in the Selenium engine: 'html' parses page_source, 'js' extracts in the page
+EXTRACTION_MODE = os.getenv('EXTRACTION_MODE', 'html').lower()
+
+# Interval of the periodic subscription sweep (in minutes), new slots are matched on scrape
+SUBSCRIPTION_SWEEP_INTERVAL = int(os.getenv('SUBSCRIPTION_SWEEP_INTERVAL', '30'))
+
+# Telegram Bot API endpoint and send rate limits (messages per second)
+TELEGRAM_API_URL = os.getenv('TELEGRAM_API_URL', 'https://api.telegram.org/bot')
+TELEGRAM_GLOBAL_RATE = float(os.getenv('TELEGRAM_GLOBAL_RATE', '25'))
+TELEGRAM_CHAT_RATE = float(os.getenv('TELEGRAM_CHAT_RATE', '1'))
+NOTIFICATION_CONCURRENCY = int(os.getenv('NOTIFICATION_CONCURRENCY', '8'))
+NOTIFICATION_MAX_RETRIES = int(os.getenv('NOTIFICATION_MAX_RETRIES', '3'))
+# Seconds a task waits for its queued notifications before giving up on them
+NOTIFICATION_FLUSH_TIMEOUT = float(os.getenv('NOTIFICATION_FLUSH_TIMEOUT', '120'))
+
+# Redis used for shared state (defaults to the Celery broker)
+REDIS_URL = os.getenv('REDIS_URL', CELERY_BROKER_URL)
+# Seconds before connecting again after Redis was found unreachable
+REDIS_RETRY_INTERVAL = float(os.getenv('REDIS_RETRY_INTERVAL', '30'))
+
+# Notification deduplication: a slot is not notified twice to a chat within the TTL (in seconds)
+NOTIFICATION_DEDUP_TTL = int(os.getenv('NOTIFICATION_DEDUP_TTL', str(24 * 60 * 60)))
+NOTIFICATION_DEDUP_MAX_SLOTS = int(os.getenv('NOTIFICATION_DEDUP_MAX_SLOTS', '10000'))
+
+# SQLite database shared by the bot, the worker and beat
+DATABASE_PATH = os.getenv('DATABASE_PATH', '/app/data/padel_bot.db')
+DATABASE_BUSY_TIMEOUT = float(os.getenv('DATABASE_BUSY_TIMEOUT', '30'))
+
+# Availability read cache, entries also expire after the TTL (in seconds)
+AVAILABILITY_CACHE_TTL = int(os.getenv('AVAILABILITY_CACHE_TTL', '300'))
+AVAILABILITY_CACHE_SIZE = int(os.getenv('AVAILABILITY_CACHE_SIZE', '2048'))
+# How long a process reuses the shared snapshot version before reading it again from Redis (in seconds)
+AVAILABILITY_VERSION_INTERVAL = float(os.getenv('AVAILABILITY_VERSION_INTERVAL', '2'))
+
+# Venue registry (JSON list), when unset a single venue is built from BASE_URL
+VENUES_FILE = os.getenv('VENUES_FILE', '')
+
+# Adaptive scrape scheduling (intervals in minutes, night hours in local time)
+ADAPTIVE_SCHEDULING = os.getenv('ADAPTIVE_SCHEDULING', 'True').lower() == 'true'
+SCHEDULER_TICK = int(os.getenv('SCHEDULER_TICK', '30'))  # seconds
+SCRAPE_MIN_INTERVAL = float(os.getenv('SCRAPE_MIN_INTERVAL', '1'))
+SCRAPE_MAX_INTERVAL = float(os.getenv('SCRAPE_MAX_INTERVAL', '30'))
+SCRAPE_DEMAND_DAYS = int(os.getenv('SCRAPE_DEMAND_DAYS', '2'))
+SCRAPE_NIGHT_START = int(os.getenv('SCRAPE_NIGHT_START', '0'))
+SCRAPE_NIGHT_END = int(os.getenv('SCRAPE_NIGHT_END', '7'))
+
+# Slot open/close history, one compressed segment per venue and month
+HISTORY_ENABLED = os.getenv('HISTORY_ENABLED', 'True').lower() == 'true'
+HISTORY_DIR = os.getenv('HISTORY_DIR', '/app/data/history')
+HISTORY_RETENTION_DAYS = int(os.getenv('HISTORY_RETENTION_DAYS', '365'))
+
+# Prometheus metrics endpoints (0 disables them)
+BOT_METRICS_PORT = int(os.getenv('BOT_METRICS_PORT', '9100'))
+WORKER_METRICS_PORT = int(os.getenv('WORKER_METRICS_PORT', '9101'))
+
+# Bot database access: blocking calls run on a bounded thread pool (0 runs them inline)
+DB_EXECUTOR_WORKERS = int(os.getenv('DB_EXECUTOR_WORKERS', '4'))
+DB_EXECUTOR_MAX_PENDING = int(os.getenv('DB_EXECUTOR_MAX_PENDING', '256'))
+BOT_CONCURRENT_UPDATES = int(os.getenv('BOT_CONCURRENT_UPDATES', '64'))
+
+# Headless Chrome page loading: 'eager' returns once the DOM is ready, and the
+# block profile ('off', 'light', 'aggressive') skips trackers, images, fonts...
+PAGE_LOAD_STRATEGY = os.getenv('PAGE_LOAD_STRATEGY', 'eager').lower()
+BLOCK_PROFILE = os.getenv('BLOCK_PROFILE', 'light').lower()
+BLOCKED_URL_PATTERNS = [pattern.strip() for pattern in os.getenv('BLOCKED_URL_PATTERNS', '').split(',') if pattern.strip()]
+
+# Scrape runs: the soft time limit aborts the run and kills its browser, the hard
+# limit kills the worker child (seconds); lock files are used when Redis is down
+SCRAPE_SOFT_TIME_LIMIT = int(os.getenv('SCRAPE_SOFT_TIME_LIMIT', '120'))
+SCRAPE_TIME_LIMIT = int(os.getenv('SCRAPE_TIME_LIMIT', '180'))
+SCRAPE_LOCK_DIR = os.getenv('SCRAPE_LOCK_DIR', '/app/data/locks')
+
+# Logging: minimum level, 'text' or 'json' records, and a background writer
+# thread so log calls never wait on the console or the log file
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()
+LOG_DIR = os.getenv('LOG_DIR', 'logs')
+ASYNC_LOGGING = os.getenv('ASYNC_LOGGING', 'True').lower() == 'true'
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
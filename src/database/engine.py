@@ -0,0 +1,81 @@
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.logger import setup_logger
+from src.config import DATABASE_PATH, DATABASE_BUSY_TIMEOUT
+from src.database.migrations import init_db
+
+logger = setup_logger(__name__)
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """
+    Get the pooled engine shared by every manager in this process.
+
+    The engine is created, and the database migrated, on first use so
+    importing the managers stays cheap.
+
+    Returns:
+        Engine: The SQLAlchemy engine
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(
+                    f'sqlite:///{DATABASE_PATH}',
+                    pool_size=5,
+                    max_overflow=10,
+                    connect_args={'timeout': DATABASE_BUSY_TIMEOUT}
+                )
+                event.listen(engine, 'connect', set_sqlite_pragmas)
+
+                # Migrate legacy files and create all tables
+                init_db(engine)
+                Session.configure(bind=engine)
+                _engine = engine
+    return _engine
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune every new SQLite connection. WAL lets the bot read while the worker
+    writes, and busy_timeout makes writers wait instead of failing with
+    "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute(f'PRAGMA busy_timeout={int(DATABASE_BUSY_TIMEOUT * 1000)}')
+    cursor.execute('PRAGMA cache_size=-16000')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.close()
+
+
+# Objects stay readable after the session that loaded them is closed
+Session = sessionmaker(expire_on_commit=False)
+
+
+@contextmanager
+def session_scope():
+    """
+    Provide a short-lived session for one unit of work, committed on success
+    and rolled back on error.
+    """
+    get_engine()
+    session = Session()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
@@ -0,0 +1,37 @@
+from datetime import date, datetime, time
+
+# Formats used by the scraper and the bot commands
+DAY_FORMAT = '%d/%m/%Y'
+HOUR_FORMAT = '%H:%M'
+
+
+def parse_day(day):
+    """
+    Convert a DD/MM/YYYY string to a date, dates are returned unchanged.
+
+    Raises:
+        ValueError: If the day format is invalid
+    """
+    if isinstance(day, date):
+        return day
+    return datetime.strptime(day, DAY_FORMAT).date()
+
+
+def parse_hour(hour):
+    """
+    Convert an HH:MM string to a time, times are returned unchanged.
+
+    Raises:
+        ValueError: If the hour format is invalid
+    """
+    if isinstance(hour, time):
+        return hour
+    return datetime.strptime(hour, HOUR_FORMAT).time()
+
+
+def format_day(day):
+    return day.strftime(DAY_FORMAT)
+
+
+def format_hour(hour):
+    return hour.strftime(HOUR_FORMAT)
@@ -0,0 +1,128 @@
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+
+from src.logger import setup_logger
+from src.database.models import Base, AvailableSlot, Subscription
+from src.database.formats import parse_day, parse_hour
+
+logger = setup_logger(__name__)
+
+# Tables whose day/hour columns used to be DD/MM/YYYY and HH:MM strings
+TYPED_TABLES = [AvailableSlot.__table__, Subscription.__table__]
+
+
+def _column_types(cursor, table_name):
+    cursor.execute(f'PRAGMA table_info({table_name})')
+    return {row[1]: (row[2] or '').upper() for row in cursor.fetchall()}
+
+
+def _is_legacy(cursor, table_name):
+    day_type = _column_types(cursor, table_name).get('day')
+    return day_type is not None and ('CHAR' in day_type or day_type == 'TEXT')
+
+
+def _bind_processor(column, dialect):
+    # Converts Python values to the storage format SQLAlchemy uses for the column
+    processor = column.type.dialect_impl(dialect).bind_processor(dialect)
+    return processor or (lambda value: value)
+
+
+def _migrate_table(cursor, table, dialect):
+    """
+    Rebuild a legacy table with typed day/hour columns, converting every row.
+    Rows whose day or hour cannot be parsed are dropped.
+    """
+    legacy_name = f'{table.name}_legacy'
+    bind_day = _bind_processor(table.c.day, dialect)
+    bind_hour = _bind_processor(table.c.hour, dialect)
+
+    cursor.execute(f'ALTER TABLE {table.name} RENAME TO {legacy_name}')
+    cursor.execute(str(CreateTable(table).compile(dialect=dialect)))
+    for index in table.indexes:
+        cursor.execute(str(CreateIndex(index).compile(dialect=dialect)))
+
+    # Columns added after the legacy schema are filled by their server defaults
+    legacy_columns = _column_types(cursor, legacy_name)
+    columns = [column.name for column in table.columns if column.name in legacy_columns]
+
+    cursor.execute(f'SELECT {", ".join(columns)} FROM {legacy_name}')
+    converted, dropped = [], 0
+    for row in cursor.fetchall():
+        record = dict(zip(columns, row))
+        try:
+            record['day'] = bind_day(parse_day(record['day']))
+            record['hour'] = bind_hour(parse_hour(record['hour']))
+        except (TypeError, ValueError):
+            dropped += 1
+            continue
+        converted.append(tuple(record[column] for column in columns))
+
+    placeholders = ', '.join('?' for _ in columns)
+    cursor.executemany(
+        f'INSERT INTO {table.name} ({", ".join(columns)}) VALUES ({placeholders})',
+        converted
+    )
+    cursor.execute(f'DROP TABLE {legacy_name}')
+    logger.info(f"Migrated table {table.name} to typed columns: {len(converted)} rows kept, {dropped} dropped")
+
+
+def _add_missing_columns(cursor, table, dialect):
+    """
+    Add columns introduced after a table was created. New columns must be
+    nullable or have a server default.
+    """
+    existing = _column_types(cursor, table.name)
+    if not existing:
+        return
+
+    for column in table.columns:
+        if column.name not in existing:
+            cursor.execute(f'ALTER TABLE {table.name} ADD COLUMN {CreateColumn(column).compile(dialect=dialect)}')
+            logger.info(f"Added column {table.name}.{column.name}")
+
+    for index in table.indexes:
+        cursor.execute(str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect)))
+
+
+def migrate_legacy_tables(engine):
+    """
+    Convert padel_bot.db files created with string day/hour columns and add
+    the columns and indexes introduced since a file was created.
+    The whole migration runs in one immediate transaction so concurrent
+    processes starting on the same file wait instead of migrating twice.
+
+    Args:
+        engine (Engine): SQLite engine
+    """
+    connection = engine.raw_connection()
+    try:
+        dbapi_connection = connection.driver_connection
+        previous_isolation = dbapi_connection.isolation_level
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            for table in TYPED_TABLES:
+                if _is_legacy(cursor, table.name):
+                    _migrate_table(cursor, table, engine.dialect)
+                else:
+                    _add_missing_columns(cursor, table, engine.dialect)
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        finally:
+            cursor.close()
+            dbapi_connection.isolation_level = previous_isolation
+    finally:
+        connection.close()
+
+
+def init_db(engine):
+    """
+    Migrate legacy tables and create the missing tables and indexes.
+
+    Args:
+        engine (Engine): SQLite engine
+    """
+    migrate_legacy_tables(engine)
+    Base.metadata.create_all(engine)
@@ -1,5 +1,6 @@
 from .available_slots_model import AvailableSlot
 from .subscription_model import Subscription
+from .subscription_rule_model import SubscriptionRule
 from .base_model import Base
 
-__all__ = ['AvailableSlot', 'Base', 'Subscription']
+__all__ = ['AvailableSlot', 'Base', 'Subscription', 'SubscriptionRule']
@@ -1,19 +1,27 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, Date, Time, DateTime, Index
 
 from datetime import datetime
 
 from src.database.models.base_model import Base
 
+# Venue of slots saved without one, and of rows created before venues existed
+DEFAULT_VENUE = 'default'
+
 
 class AvailableSlot(Base):
     __tablename__ = 'available_slots'
+    __table_args__ = (
+        Index('ix_available_slots_day_hour', 'day', 'hour'),
+        Index('ix_available_slots_venue_day_hour', 'venue', 'day', 'hour'),
+    )
 
     id = Column(Integer, primary_key=True)
-    day = Column(String, nullable=False)  # Format: DD/MM/YYYY
-    hour = Column(String, nullable=False)  # Format: HH:MM
+    venue = Column(String, nullable=False, default=DEFAULT_VENUE, server_default=DEFAULT_VENUE)
+    day = Column(Date, nullable=False)
+    hour = Column(Time, nullable=False)
     court = Column(String, nullable=False)
     attributes = Column(String)
     created_at = Column(DateTime, default=datetime.now)
 
     def __repr__(self):
-        return f"<AvailableSlot(day='{self.day}', hour='{self.hour}', court='{self.court}')>" 
+        return f"<AvailableSlot(venue='{self.venue}', day='{self.day}', hour='{self.hour}', court='{self.court}')>" 
@@ -1,18 +1,21 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, DateTime
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Integer, String, Date, Time, DateTime, Index
 
 from src.database.models.base_model import Base
 
 
 class Subscription(Base):
     __tablename__ = 'subscriptions'
+    __table_args__ = (
+        Index('ix_subscriptions_chat_id_day', 'chat_id', 'day'),
+        Index('ix_subscriptions_day_hour', 'day', 'hour'),
+    )
 
     id = Column(Integer, primary_key=True)
     chat_id = Column(String, nullable=False)
-    day = Column(String, nullable=False)
-    hour = Column(String, nullable=False)
+    day = Column(Date, nullable=False)
+    hour = Column(Time, nullable=False)
     created_at = Column(DateTime, default=datetime.now)
 
     def __repr__(self):
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Date, Time, DateTime, Index
+
+from src.database.models.base_model import Base
+
+# Bit of each weekday in the weekdays mask, Monday first like date.weekday()
+WEEKDAY_BITS = [1 << weekday for weekday in range(7)]
+
+
+class SubscriptionRule(Base):
+    """
+    Recurring subscription: every weekday of a mask, between two hours,
+    within a date range. One row replaces a subscription per date.
+    """
+    __tablename__ = 'subscription_rules'
+    __table_args__ = (
+        Index('ix_subscription_rules_chat_id', 'chat_id'),
+        Index('ix_subscription_rules_end_date', 'end_date'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    chat_id = Column(String, nullable=False)
+    weekdays = Column(Integer, nullable=False)
+    start_hour = Column(Time, nullable=False)
+    end_hour = Column(Time, nullable=False)
+    start_date = Column(Date, nullable=False)
+    # Open-ended when empty
+    end_date = Column(Date)
+    created_at = Column(DateTime, default=datetime.now)
+
+    def covers(self, day):
+        """
+        Returns:
+            bool: True if the rule applies to the date
+        """
+        return (
+            self.weekdays & WEEKDAY_BITS[day.weekday()] != 0
+            and self.start_date <= day
+            and (self.end_date is None or day <= self.end_date)
+        )
+
+    def __repr__(self):
+        return (f"<SubscriptionRule (weekdays={self.weekdays:07b}, hours='{self.start_hour}-{self.end_hour}', "
+                f"dates='{self.start_date}-{self.end_date}', chat_id='{self.chat_id}')>")
@@ -1,5 +1,6 @@
 from .available_slots_manager import AvailableSlotsManager, save_slots, get_available_slots_by_day_and_hour
 from .subscription_manager import SubscriptionManager
+from .subscription_rule_manager import SubscriptionRuleManager
 
-__all__ = ['AvailableSlotsManager', 'save_slots', 'get_available_slots_by_day_and_hour', 'SubscriptionManager']
- 
\ No newline at end of file
+__all__ = ['AvailableSlotsManager', 'save_slots', 'get_available_slots_by_day_and_hour', 'SubscriptionManager',
+           'SubscriptionRuleManager']
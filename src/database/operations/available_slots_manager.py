@@ -1,62 +1,120 @@
-import os
+from sqlalchemy import delete, insert
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 
 from src.logger import setup_logger
-from src.database.models.base_model import Base
-from src.database.models.available_slots_model import AvailableSlot
-from src.database.models.subscription_model import Subscription
+from src.database.models.available_slots_model import AvailableSlot, DEFAULT_VENUE
+from src.database.formats import parse_day, parse_hour, format_day, format_hour
+from src.database.engine import session_scope
+from src.availability_cache import availability_cache
 
 logger = setup_logger(__name__)
 
-# Create the SQLite database with an absolute path
-db_path = os.path.join('/app/data', 'padel_bot.db')
-engine = create_engine(f'sqlite:///{db_path}')
+# Maximum number of ids bound in a single DELETE ... IN statement
+DELETE_CHUNK_SIZE = 500
 
-# Create all tables
-Base.metadata.create_all(engine)
+# Subscriptions match slots starting up to 3 hours after the requested hour
+HOUR_WINDOW = timedelta(hours=3)
 
-class AvailableSlotsManager:
-    def __init__(self):
-        self.Session = sessionmaker(bind=engine)
+def hour_window(hour):
+    """
+    Compute the window of slots matching a requested hour
+
+    Args:
+        hour (str | time): Hour in format HH:MM
+
+    Returns:
+        tuple: (start time, end time), the end is capped at the end of the day
+    """
+    target_hour = parse_hour(hour)
+
+    # Calculate end hour (3 hours after target hour)
+    today = date.today()
+    end_hour = datetime.combine(today, target_hour) + HOUR_WINDOW
+    end_hour = end_hour.time() if end_hour.date() == today else time.max
 
-    def save_slots(self, slots):
+    return target_hour, end_hour
+
+class AvailableSlotsManager:
+    def save_slots(self, slots, venue=DEFAULT_VENUE):
         """
-        Save the available slots in the database
+        Synchronize the stored slots of a venue with a freshly scraped set,
+        inserting only new slots and removing only the ones that vanished
         
         Args:
             slots (list): List of available slots
+            venue (str): Slug of the venue the slots were scraped from
+
+        Returns:
+            dict: {'added': list of new slots, 'removed': list of vanished slots},
+                  every slot tagged with its 'venue'
         """
-        session = self.Session()
-        
+        # Slots of a venue are identified by day, hour and court. A malformed
+        # scraped value only drops its own slot, not the whole sync
+        scraped = {}
+        skipped = []
+        for slot in slots:
+            try:
+                key = (parse_day(slot['day']), parse_hour(slot['hour']), slot['court'])
+            except (KeyError, TypeError, ValueError):
+                skipped.append(slot)
+                continue
+            scraped.setdefault(key, slot)
+
+        if skipped:
+            logger.warning(f"Skipping {len(skipped)} unparsable slots of venue {venue}, e.g. {skipped[0]!r}")
+            if not scraped:
+                # Nothing usable was scraped, keep the stored slots instead of removing them all
+                logger.error(f"No parsable slots for venue {venue}, stored slots left unchanged")
+                return {'added': [], 'removed': []}
+
         try:
-            # Delete all existing records
-            session.query(AvailableSlot).delete()
-            session.commit()
-            logger.info(f"Deleted existing records from database")
-            
-            # Save the new slots
-            for slot in slots:
-                # Convert the slot to an AvailableSlot object
-                db_slot = AvailableSlot(
-                    day=slot['day'],
-                    hour=slot['hour'],
-                    court=slot['court'],
-                    attributes=slot['attributes']
-                )
-                session.add(db_slot)
-
-            session.commit()
-            logger.info(f"Successfully saved {len(slots)} slots to database")
+            with session_scope() as session:
+                stored = {
+                    (row.day, row.hour, row.court): row.id
+                    for row in session.query(AvailableSlot.id, AvailableSlot.day, AvailableSlot.hour, AvailableSlot.court)
+                        .filter(AvailableSlot.venue == venue)
+                }
+
+                added_keys = sorted(scraped.keys() - stored.keys())
+                removed_keys = sorted(stored.keys() - scraped.keys())
+
+                # Remove the vanished slots in bulk, chunked to stay under SQLite's variable limit
+                removed_ids = [stored[key] for key in removed_keys]
+                for i in range(0, len(removed_ids), DELETE_CHUNK_SIZE):
+                    session.execute(
+                        delete(AvailableSlot).where(AvailableSlot.id.in_(removed_ids[i:i + DELETE_CHUNK_SIZE]))
+                    )
+
+                # Insert the new slots in a single executemany
+                added = [{**scraped[key], 'venue': venue} for key in added_keys]
+                if added:
+                    session.execute(insert(AvailableSlot), [
+                        {
+                            'venue': venue,
+                            'day': day,
+                            'hour': hour,
+                            'court': court,
+                            'attributes': scraped[(day, hour, court)]['attributes']
+                        }
+                        for day, hour, court in added_keys
+                    ])
+
+            logger.info(f"Synchronized slots of venue {venue}: {len(added)} added, {len(removed_keys)} removed, "
+                        f"{len(scraped) - len(added)} unchanged")
+
+            # Cached lookups are stale once the snapshot changed
+            if added or removed_keys:
+                availability_cache.invalidate()
+
+            removed = [
+                {'venue': venue, 'day': format_day(day), 'hour': format_hour(hour), 'court': court}
+                for day, hour, court in removed_keys
+            ]
+            return {'added': added, 'removed': removed}
         except Exception as e:
-            session.rollback()
             logger.error(f"Error saving slots to database: {str(e)}")
             raise e
-        finally:
-            session.close()
 
     def get_available_slots_by_day_and_hour(self, day, hour):
         """
@@ -69,47 +127,69 @@ class AvailableSlotsManager:
         Returns:
             list: List of available slots
         """
-        session = self.Session()
         try:
-            # Get slots for the specified day
+            # Served from the cache until the next scrape changes the slots
+            key = (parse_day(day), parse_hour(hour))
+            return list(availability_cache.get_or_load(key, lambda: self._query_slots(*key)))
+        except Exception as e:
+            logger.error(f"Error getting available slots: {str(e)}")
+            raise e
+
+    def _query_slots(self, day, hour):
+        # Filter slots by day and hour range (3 hours window) with the (day, hour) index
+        start_hour, end_hour = hour_window(hour)
+        with session_scope() as session:
             slots = session.query(AvailableSlot) \
-                .filter(AvailableSlot.day == day) \
+                .filter(
+                    AvailableSlot.day == day,
+                    AvailableSlot.hour >= start_hour,
+                    AvailableSlot.hour <= end_hour
+                ) \
+                .order_by(AvailableSlot.hour, AvailableSlot.id) \
                 .all()
 
-            # Filter slots by hour range (3 hours window)
-            filtered_slots = []
-            target_hour = datetime.strptime(hour, '%H:%M').time()
-            
-            # Calculate end hour (3 hours after target hour)
-            end_hour = datetime.combine(datetime.today(), target_hour) + timedelta(hours=3)
-            end_hour = end_hour.time()
-            
-            for slot in slots:
-                slot_hour = datetime.strptime(slot.hour, '%H:%M').time()
-                # Check if slot is within 3 hours window
-                if target_hour <= slot_hour <= end_hour:
-                    filtered_slots.append({
-                        'fecha': slot.day,
-                        'hora': slot.hour,
-                        'cancha': slot.court
-                    })
-            
-            # Sort slots by hour
-            filtered_slots.sort(key=lambda x: x['hora'])
-            
-            return filtered_slots
+        return [
+            {
+                'fecha': format_day(slot.day),
+                'hora': format_hour(slot.hour),
+                'cancha': slot.court,
+                'sede': slot.venue
+            }
+            for slot in slots
+        ]
+
+    def get_slots_since(self, day=None):
+        """
+        Get every stored slot from a day on, for sweeps that match slots
+        against recurring rules instead of querying per subscription.
+
+        Args:
+            day (date, optional): First day, defaults to the current date
+
+        Returns:
+            list: List of {'day', 'hour', 'court', 'venue'} dicts, sorted by day and hour
+        """
+        try:
+            with session_scope() as session:
+                rows = session.query(AvailableSlot.day, AvailableSlot.hour, AvailableSlot.court, AvailableSlot.venue) \
+                    .filter(AvailableSlot.day >= (day or date.today())) \
+                    .order_by(AvailableSlot.day, AvailableSlot.hour, AvailableSlot.id) \
+                    .all()
+
+            return [
+                {'day': format_day(row.day), 'hour': format_hour(row.hour), 'court': row.court, 'venue': row.venue}
+                for row in rows
+            ]
         except Exception as e:
-            logger.error(f"Error getting available slots: {str(e)}")
+            logger.error(f"Error getting slots: {str(e)}")
             raise e
-        finally:
-            session.close()
 
 # Create a global instance of AvailableSlotsManager
 available_slots_manager = AvailableSlotsManager()
 
 # For backward compatibility
-def save_slots(slots):
-    return available_slots_manager.save_slots(slots)
+def save_slots(slots, venue=DEFAULT_VENUE):
+    return available_slots_manager.save_slots(slots, venue)
 
 def get_available_slots_by_day_and_hour(day, hour):
     return available_slots_manager.get_available_slots_by_day_and_hour(day, hour) 
\ No newline at end of file
@@ -1,36 +1,22 @@
-import os
+from sqlalchemy import delete
 
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
-
-from datetime import datetime
+from datetime import date
 
 from src.logger import setup_logger
-from src.database.models.base_model import Base
-from src.database.models.available_slots_model import AvailableSlot
 from src.database.models.subscription_model import Subscription
+from src.database.formats import parse_day, parse_hour
+from src.database.engine import session_scope
 
 logger = setup_logger(__name__)
 
-# Create the SQLite database with an absolute path
-db_path = os.path.join('/app/data', 'padel_bot.db')
-engine = create_engine(f'sqlite:///{db_path}')
-
-# Create all tables
-Base.metadata.create_all(engine)
-
 class SubscriptionManager:
-    def __init__(self):
-        self.Session = sessionmaker(bind=engine)
-        self.session = self.Session()
-
     def add_subscription(self, day, hour, chat_id):
         """
         Add a new subscription to the database.
         
         Args:
-            day (str): Day of the week for the subscription
-            hour (str): Hour of the day for the subscription
+            day (str): Day of the subscription in format DD/MM/YYYY
+            hour (str): Hour of the subscription in format HH:MM
             chat_id (int): Telegram chat ID of the subscriber
             
         Returns:
@@ -45,14 +31,13 @@ class SubscriptionManager:
             if not isinstance(day, str) or not isinstance(hour, str):
                 raise ValueError("Day and hour must be strings")
                 
-            subscription = Subscription(day=day, hour=hour, chat_id=chat_id)
-            self.session.add(subscription)
-            self.session.commit()
+            subscription = Subscription(day=parse_day(day), hour=parse_hour(hour), chat_id=chat_id)
+            with session_scope() as session:
+                session.add(subscription)
             logger.info(f"Added new subscription for chat_id {chat_id} on {day} at {hour}")
             return subscription
             
         except Exception as e:
-            self.session.rollback()
             logger.error(f"Error adding subscription: {str(e)}")
             raise
 
@@ -70,12 +55,60 @@ class SubscriptionManager:
             SQLAlchemyError: If there's an error during database operations
         """
         try:
-            query = self.session.query(Subscription)
-            return query.all()
+            with session_scope() as session:
+                query = session.query(Subscription)
+                if chat_id is not None:
+                    query = query.filter(Subscription.chat_id == str(chat_id))
+                return query.all()
         except Exception as e:
             logger.error(f"Error retrieving subscriptions: {str(e)}")
             raise
 
+    def get_subscriptions_by_days(self, days):
+        """
+        Retrieve the subscriptions for a set of days.
+        
+        Args:
+            days (iterable): Days in format DD/MM/YYYY
+            
+        Returns:
+            list: List of Subscription objects
+            
+        Raises:
+            SQLAlchemyError: If there's an error during database operations
+        """
+        try:
+            with session_scope() as session:
+                return session.query(Subscription) \
+                    .filter(Subscription.day.in_([parse_day(day) for day in days])) \
+                    .all()
+        except Exception as e:
+            logger.error(f"Error retrieving subscriptions by days: {str(e)}")
+            raise
+
+    def delete_past_subscriptions(self, today=None):
+        """
+        Delete every subscription for a day before today in a single statement.
+        
+        Args:
+            today (date, optional): Reference day, defaults to the current date
+            
+        Returns:
+            int: Number of deleted subscriptions
+            
+        Raises:
+            SQLAlchemyError: If there's an error during database operations
+        """
+        try:
+            with session_scope() as session:
+                result = session.execute(
+                    delete(Subscription).where(Subscription.day < (today or date.today()))
+                )
+                return result.rowcount
+        except Exception as e:
+            logger.error(f"Error deleting past subscriptions: {str(e)}")
+            raise
+
 # Create a global instance of AvailableSlotsManager
 subscription_manager = SubscriptionManager()
 
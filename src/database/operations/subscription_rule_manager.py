@@ -0,0 +1,161 @@
+from sqlalchemy import delete, or_
+
+from datetime import date
+
+from src.logger import setup_logger
+from src.database.models.subscription_rule_model import SubscriptionRule
+from src.database.formats import parse_day, parse_hour
+from src.database.engine import session_scope
+
+logger = setup_logger(__name__)
+
+class SubscriptionRuleManager:
+    def add_rule(self, chat_id, weekdays, start_hour, end_hour, start_date, end_date=None):
+        """
+        Add a recurring subscription rule to the database.
+
+        Args:
+            chat_id (int): Telegram chat ID of the subscriber
+            weekdays (int): Weekday mask, bit 0 is Monday
+            start_hour (str | time): First slot hour in format HH:MM
+            end_hour (str | time): Last slot hour in format HH:MM
+            start_date (str | date): First day in format DD/MM/YYYY
+            end_date (str | date, optional): Last day in format DD/MM/YYYY, open-ended if None
+
+        Returns:
+            SubscriptionRule: The created rule
+
+        Raises:
+            ValueError: If a field is invalid
+            SQLAlchemyError: If there's an error during database operations
+        """
+        try:
+            if not 0 < weekdays < 1 << 7:
+                raise ValueError("At least one weekday is required")
+
+            rule = SubscriptionRule(
+                chat_id=str(chat_id),
+                weekdays=weekdays,
+                start_hour=parse_hour(start_hour),
+                end_hour=parse_hour(end_hour),
+                start_date=parse_day(start_date),
+                end_date=parse_day(end_date) if end_date is not None else None
+            )
+            if rule.end_hour < rule.start_hour:
+                raise ValueError("The end hour must not be before the start hour")
+            if rule.end_date is not None and rule.end_date < rule.start_date:
+                raise ValueError("The end date must not be before the start date")
+
+            with session_scope() as session:
+                session.add(rule)
+            logger.info(f"Added subscription rule {rule.id} for chat_id {chat_id}")
+            return rule
+
+        except Exception as e:
+            logger.error(f"Error adding subscription rule: {str(e)}")
+            raise
+
+    def get_rules(self, chat_id=None):
+        """
+        Retrieve subscription rules from the database.
+
+        Args:
+            chat_id (int, optional): Filter rules by chat_id
+
+        Returns:
+            list: List of SubscriptionRule objects
+
+        Raises:
+            SQLAlchemyError: If there's an error during database operations
+        """
+        try:
+            with session_scope() as session:
+                query = session.query(SubscriptionRule)
+                if chat_id is not None:
+                    query = query.filter(SubscriptionRule.chat_id == str(chat_id))
+                return query.order_by(SubscriptionRule.id).all()
+        except Exception as e:
+            logger.error(f"Error retrieving subscription rules: {str(e)}")
+            raise
+
+    def get_active_rules(self, days):
+        """
+        Retrieve the rules whose date range overlaps a set of days. Weekdays
+        are not filtered here, the rule index checks them per slot.
+
+        Args:
+            days (iterable): Days in format DD/MM/YYYY
+
+        Returns:
+            list: List of SubscriptionRule objects
+
+        Raises:
+            SQLAlchemyError: If there's an error during database operations
+        """
+        days = [parse_day(day) for day in days]
+        if not days:
+            return []
+        try:
+            with session_scope() as session:
+                return session.query(SubscriptionRule) \
+                    .filter(
+                        SubscriptionRule.start_date <= max(days),
+                        or_(SubscriptionRule.end_date.is_(None), SubscriptionRule.end_date >= min(days))
+                    ) \
+                    .all()
+        except Exception as e:
+            logger.error(f"Error retrieving active subscription rules: {str(e)}")
+            raise
+
+    def delete_rule(self, rule_id, chat_id):
+        """
+        Delete a rule owned by a chat.
+
+        Args:
+            rule_id (int): ID of the rule
+            chat_id (int): Telegram chat ID of the owner
+
+        Returns:
+            bool: True if the rule existed and was deleted
+
+        Raises:
+            SQLAlchemyError: If there's an error during database operations
+        """
+        try:
+            with session_scope() as session:
+                result = session.execute(
+                    delete(SubscriptionRule).where(
+                        SubscriptionRule.id == rule_id,
+                        SubscriptionRule.chat_id == str(chat_id)
+                    )
+                )
+                return result.rowcount > 0
+        except Exception as e:
+            logger.error(f"Error deleting subscription rule: {str(e)}")
+            raise
+
+    def delete_expired_rules(self, today=None):
+        """
+        Delete every rule whose date range ended before today in a single statement.
+
+        Args:
+            today (date, optional): Reference day, defaults to the current date
+
+        Returns:
+            int: Number of deleted rules
+
+        Raises:
+            SQLAlchemyError: If there's an error during database operations
+        """
+        try:
+            with session_scope() as session:
+                result = session.execute(
+                    delete(SubscriptionRule).where(SubscriptionRule.end_date < (today or date.today()))
+                )
+                return result.rowcount
+        except Exception as e:
+            logger.error(f"Error deleting expired subscription rules: {str(e)}")
+            raise
+
+# Create a global instance of SubscriptionRuleManager
+subscription_rule_manager = SubscriptionRuleManager()
@@ -0,0 +1,74 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.logger import setup_logger
+from src.config import DB_EXECUTOR_WORKERS, DB_EXECUTOR_MAX_PENDING
+
+logger = setup_logger(__name__)
+
+
+class DatabaseExecutor:
+    """
+    Runs blocking database calls from async handlers on a bounded thread pool,
+    so a slow query or a locked SQLite file does not stall the event loop.
+
+    At most `max_pending` calls wait or run at once, further callers wait
+    on the event loop for a free place. With `max_workers=0` calls run inline.
+    """
+
+    def __init__(self, max_workers=DB_EXECUTOR_WORKERS, max_pending=DB_EXECUTOR_MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix='db'
+                    )
+        return self._executor
+
+    def _semaphore(self, loop):
+        # asyncio primitives belong to one loop
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_pending)
+        return semaphore
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run a blocking call without blocking the event loop.
+
+        Args:
+            func (callable): Blocking function, e.g. a manager method
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The value returned by func
+        """
+        if not self.max_workers:
+            return func(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        async with self._semaphore(loop):
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self):
+        """
+        Wait for the running calls and stop the worker threads.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# Create a global instance of DatabaseExecutor for this process
+db_executor = DatabaseExecutor()
@@ -0,0 +1,272 @@
+import atexit
+import os
+import signal
+import threading
+
+from src.logger import setup_logger
+from src.config import DRIVER_POOL_SIZE, DRIVER_MAX_USES, PAGE_LOAD_STRATEGY
+from src.metrics import timed
+from src.resource_blocking import get_block_profile, apply_blocking
+
+logger = setup_logger(__name__)
+
+
+def build_chrome_options(profile=None):
+    """
+    Build the ChromeDriver options used by the scraper.
+
+    Args:
+        profile (dict, optional): Block profile, defaults to BLOCK_PROFILE
+
+    Returns:
+        Options: Configured Chrome options
+    """
+    profile = profile or get_block_profile()
+
+    # Selenium is imported on first use, workers that never start a browser skip it
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-software-rasterizer')
+    chrome_options.add_argument('--disable-setuid-sandbox')
+    chrome_options.add_argument('--disable-infobars')
+    chrome_options.add_argument('--disable-browser-side-navigation')
+    chrome_options.add_argument('--disable-features=TranslateUI')
+    chrome_options.add_argument('--disable-popup-blocking')
+    chrome_options.add_argument('--disable-notifications')
+    chrome_options.add_argument('--disable-default-apps')
+    chrome_options.add_argument('--disable-web-security')
+    chrome_options.add_argument('--disable-features=IsolateOrigins,site-per-process')
+
+    # Return from get() once the DOM is ready, the readiness waits do the rest
+    chrome_options.page_load_strategy = PAGE_LOAD_STRATEGY
+    if profile['block_images']:
+        # Block images by resource type, whatever their URL
+        chrome_options.add_experimental_option(
+            'prefs', {'profile.managed_default_content_settings.images': 2}
+        )
+
+    # Network events feed the per-scrape transferred bytes report
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return chrome_options
+
+
+def create_driver(profile=None):
+    """
+    Start a new headless Chrome session with the request block profile applied.
+
+    Args:
+        profile (dict, optional): Block profile, defaults to BLOCK_PROFILE
+
+    Returns:
+        webdriver.Chrome: The new driver
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    profile = profile or get_block_profile()
+    with timed('driver_startup'):
+        driver = webdriver.Chrome(
+            # Own process group, so a stuck browser can be killed with its driver
+            service=Service(popen_kw={'start_new_session': True}),
+            options=build_chrome_options(profile)
+        )
+        apply_blocking(driver, profile)
+    logger.info("ChromeDriver initialized successfully.")
+    return driver
+
+
+def kill_driver(driver):
+    """
+    Kill a ChromeDriver and the browser it started without talking to them,
+    for sessions stuck past the scrape time limit.
+
+    Args:
+        driver (webdriver.Chrome): Driver to kill
+    """
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    if process is None:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait(timeout=5)
+        logger.warning(f"Killed ChromeDriver process group {process.pid}")
+    except Exception as e:
+        logger.warning(f"Error when killing ChromeDriver: {str(e)}")
+
+
+class DriverPool:
+    """
+    Pool of warm WebDriver sessions owned by a single worker process.
+
+    Drivers are health checked on checkout and recycled after `max_uses`
+    scrapes so a long-lived browser cannot leak memory forever.
+    """
+
+    def __init__(self, size=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES, factory=create_driver):
+        self.size = size
+        self.max_uses = max_uses
+        self.factory = factory
+        self._idle = []
+        self._uses = {}
+        self._in_use = 0
+        self._pid = os.getpid()
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def _is_healthy(self, driver):
+        """
+        Check that the browser behind a driver still answers commands.
+
+        Args:
+            driver (webdriver.Chrome): Driver to check
+
+        Returns:
+            bool: True if the session is usable
+        """
+        try:
+            return driver.execute_script('return 1') == 1
+        except Exception as e:
+            logger.warning(f"Discarding unhealthy ChromeDriver: {str(e)}")
+            return False
+
+    def _quit(self, driver):
+        # Called without the lock held, quitting a stuck browser can take long
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error when quitting ChromeDriver: {str(e)}")
+
+    def _reset_after_fork(self):
+        # Drivers inherited from a parent process belong to that process
+        if self._pid != os.getpid():
+            self._idle = []
+            self._uses = {}
+            self._in_use = 0
+            self._pid = os.getpid()
+            self._closed = False
+
+    def acquire(self, timeout=None):
+        """
+        Check out a warm driver, starting a new one if none is idle.
+
+        Args:
+            timeout (float, optional): Seconds to wait when the pool is exhausted
+
+        Returns:
+            webdriver.Chrome: A healthy driver
+        """
+        while True:
+            driver = None
+            with self._condition:
+                self._reset_after_fork()
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool is shut down")
+
+                    # Reserve the slot, an idle driver is health checked below
+                    if self._idle:
+                        driver = self._idle.pop()
+                        self._in_use += 1
+                        break
+
+                    if self._in_use < self.size:
+                        self._in_use += 1
+                        break
+
+                    if not self._condition.wait(timeout):
+                        raise TimeoutError("Timed out waiting for a free ChromeDriver")
+
+            if driver is None:
+                break
+
+            # Checked outside the lock, a stuck browser must not block the
+            # releases and checkouts of the other threads
+            if self._is_healthy(driver):
+                return driver
+            with self._condition:
+                self._in_use -= 1
+                self._uses.pop(id(driver), None)
+                self._condition.notify()
+            self._quit(driver)
+
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+        self._uses[id(driver)] = 0
+        return driver
+
+    def release(self, driver):
+        """
+        Return a driver to the pool, recycling it once it reached `max_uses`.
+
+        Args:
+            driver (webdriver.Chrome): Driver obtained from `acquire`
+        """
+        with self._condition:
+            self._in_use -= 1
+            uses = self._uses.get(id(driver), 0) + 1
+            recycle = self._closed or uses >= self.max_uses
+            if recycle:
+                self._uses.pop(id(driver), None)
+            else:
+                self._uses[id(driver)] = uses
+                self._idle.append(driver)
+            self._condition.notify()
+
+        # Quit outside the lock, the other threads keep checking drivers in and out
+        if recycle:
+            logger.info(f"Recycling ChromeDriver after {uses} uses")
+            self._quit(driver)
+
+    def discard(self, driver, kill=False):
+        """
+        Drop a driver that is known to be broken instead of returning it.
+
+        Args:
+            driver (webdriver.Chrome): Driver obtained from `acquire`
+            kill (bool): Kill the browser instead of asking it to quit,
+                for sessions that stopped answering
+        """
+        with self._condition:
+            self._in_use -= 1
+            self._uses.pop(id(driver), None)
+            self._condition.notify()
+
+        # Killing waits for the process, never while holding the lock
+        if kill:
+            kill_driver(driver)
+        else:
+            self._quit(driver)
+
+    def shutdown(self):
+        """
+        Quit every idle driver and refuse further checkouts.
+        """
+        with self._condition:
+            if self._pid != os.getpid():
+                return
+            self._closed = True
+            idle, self._idle = self._idle, []
+            for driver in idle:
+                self._uses.pop(id(driver), None)
+            self._condition.notify_all()
+        for driver in idle:
+            self._quit(driver)
+        if idle:
+            logger.info(f"Driver pool shut down, closed {len(idle)} ChromeDriver(s)")
+
+
+# Create a global instance of DriverPool for this process
+driver_pool = DriverPool()
+atexit.register(driver_pool.shutdown)
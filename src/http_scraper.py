@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+
+import requests
+from celery.exceptions import SoftTimeLimitExceeded
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.logger import setup_logger
+from src.config import CALENDAR_API_URL, HTTP_TIMEOUT
+
+logger = setup_logger(__name__)
+
+
+def create_session():
+    """
+    Create a pooled HTTP session with retries for the calendar API.
+
+    Returns:
+        requests.Session: Configured session
+    """
+    retry = Retry(
+        total=2,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=('GET',)
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'Accept': 'application/json',
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) PadelBot'
+    })
+    return session
+
+
+def _court_attributes(court):
+    """
+    Build the attributes text shown next to the court name in the calendar.
+
+    Args:
+        court (dict): Court entry from the availability payload
+
+    Returns:
+        str: Attributes joined the same way the calendar renders them
+    """
+    attributes = court.get('attributes')
+    if isinstance(attributes, list):
+        return ' - '.join(str(attribute) for attribute in attributes if attribute)
+    if isinstance(attributes, str):
+        return attributes
+
+    values = [court.get(key) for key in ('court_type', 'surface_type', 'cover_type')]
+    return ' - '.join(str(value) for value in values if value)
+
+
+def parse_availability(payload, day):
+    """
+    Convert an availability payload into the slot records used by save_slots.
+
+    Args:
+        payload (dict): JSON body returned by the calendar API
+        day (datetime): Day the payload belongs to
+
+    Returns:
+        list: List of {'day', 'hour', 'court', 'attributes'} dicts
+    """
+    slots = []
+    day_str = day.strftime("%d/%m/%Y")
+
+    for court in payload.get('available_courts', []):
+        court_name = court.get('name', '')
+        court_attributes = _court_attributes(court)
+
+        for slot in court.get('available_slots', []):
+            start = slot.get('start', '')
+            # Starts come as ISO datetimes (2025-03-25T18:00:00) or plain HH:MM
+            slot_time = start[11:16] if 'T' in start else start[:5]
+            if not slot_time:
+                continue
+
+            slots.append({
+                'day': day_str,
+                'hour': slot_time,
+                'court': court_name,
+                'attributes': court_attributes
+            })
+
+    return slots
+
+
+class HttpCalendarScraper:
+    """
+    Browserless scraping engine that reads the calendar from the JSON
+    endpoint the booking page itself calls.
+    """
+
+    def __init__(self, api_url=CALENDAR_API_URL, session=None, timeout=HTTP_TIMEOUT):
+        self.api_url = api_url
+        self.session = session or http_session
+        self.timeout = timeout
+
+    def get_available_slots(self, days=5):
+        """
+        Fetch available slots for the next days.
+
+        Args:
+            days (int): Number of days to fetch, starting today
+
+        Returns:
+            list: List of available slots, or None if the API could not be read
+        """
+        if not self.api_url:
+            logger.warning("CALENDAR_API_URL is not configured, HTTP engine unavailable")
+            return None
+
+        try:
+            available_slots = []
+            for offset in range(days):
+                day = datetime.now() + timedelta(days=offset)
+                response = self.session.get(
+                    self.api_url,
+                    params={'date': day.strftime("%Y-%m-%d")},
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                available_slots.extend(parse_availability(response.json(), day))
+
+            return available_slots
+
+        except SoftTimeLimitExceeded:
+            # Out of time, do not fall back to a browser scrape
+            raise
+        except Exception as e:
+            logger.error(f"Error when getting available slots over HTTP: {str(e)}")
+            return None
+
+
+# Create a global session shared by every scrape in this process
+http_session = create_session()
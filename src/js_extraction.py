@@ -0,0 +1,53 @@
+import json
+
+from src.calendar_parser import DEFAULT_SELECTORS
+
+# Walks the calendar nodes in document order inside the page and returns a
+# compact JSON array of [hour, court name, court attributes] per available cell
+EXTRACT_SLOTS_SCRIPT = """
+const [cellClass, courtClass, nameClass, attributesClass] = arguments;
+const nodes = document.querySelectorAll(
+    `div.${courtClass}, span.${nameClass}, div.${attributesClass}, span.${cellClass}.available`
+);
+const slots = [];
+let court = null;
+for (const node of nodes) {
+    const classes = node.classList;
+    if (classes.contains(courtClass)) {
+        court = {name: null, attributes: null};
+    } else if (classes.contains(nameClass)) {
+        if (court && court.name === null) court.name = node.textContent;
+    } else if (classes.contains(attributesClass)) {
+        if (court && court.attributes === null) court.attributes = node.textContent;
+    } else if (court) {
+        const hour = (node.getAttribute('data-cy') || '').replace('slot-', '');
+        slots.push([hour, court.name || '', court.attributes || '']);
+    }
+}
+return JSON.stringify(slots);
+"""
+
+
+def extract_slots(driver, day, selectors=None):
+    """
+    Extract the available slots of the displayed day with a single script call,
+    without transferring the page HTML.
+
+    Args:
+        driver (webdriver.Chrome): Driver showing the calendar
+        day (str): Day the calendar shows, in format DD/MM/YYYY
+        selectors (dict, optional): Calendar classes by kind, defaults to DEFAULT_SELECTORS
+
+    Returns:
+        list: List of {'day', 'hour', 'court', 'attributes'} dicts
+    """
+    selectors = selectors or DEFAULT_SELECTORS
+    rows = json.loads(driver.execute_script(
+        EXTRACT_SLOTS_SCRIPT,
+        selectors['cell'], selectors['court_cell'], selectors['court_name'], selectors['court_attributes']
+    ))
+
+    return [
+        {'day': day, 'hour': hour, 'court': court, 'attributes': attributes}
+        for hour, court, attributes in rows
+    ]
@@ -1,7 +1,207 @@
+import atexit
+import json
 import logging
-import sys
-from logging.handlers import RotatingFileHandler
 import os
+import queue
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from src.config import LOG_LEVEL, LOG_FORMAT, LOG_DIR, ASYNC_LOGGING, LOG_QUEUE_SIZE
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# IDs stamped on the records logged while they are set, see `log_context`
+task_id_var = ContextVar('task_id', default=None)
+scrape_id_var = ContextVar('scrape_id', default=None)
+CONTEXT_VARS = {'task_id': task_id_var, 'scrape_id': scrape_id_var}
+
+
+@contextmanager
+def log_context(**ids):
+    """
+    Tag every record logged inside the block, e.g. log_context(scrape_id='ab12').
+
+    Args:
+        **ids: Values for the 'task_id' and 'scrape_id' fields
+    """
+    tokens = [(CONTEXT_VARS[key], CONTEXT_VARS[key].set(value)) for key, value in ids.items()]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """
+    Copy the context IDs onto the record in the logging thread, the listener
+    thread does not share its context.
+    """
+
+    def filter(self, record):
+        for key, var in CONTEXT_VARS.items():
+            setattr(record, key, var.get())
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line, with the context IDs when they are set.
+    """
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key in CONTEXT_VARS:
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without waiting. Records arriving
+    while the queue is full are dropped and counted instead of blocking.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Only merge the arguments, they may change before the listener runs.
+        # Timestamps and formatting are left to the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingPipeline:
+    """
+    Handlers shared by every module logger of the process.
+
+    Levels are filtered on the loggers, before any record is built. With the
+    queue enabled, module loggers only enqueue records and a background
+    listener thread formats them and writes the console and the rotating file.
+    """
+
+    def __init__(self):
+        self.level = logging.NOTSET
+        self.handlers = []
+        self.listener = None
+        self._loggers = set()
+        self._settings = None
+
+    def _output_handlers(self, fmt, directory):
+        os.makedirs(directory, exist_ok=True)
+        formatter = JsonFormatter() if fmt == 'json' else logging.Formatter(TEXT_FORMAT)
+
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
+
+        file_handler = RotatingFileHandler(
+            filename=os.path.join(directory, 'padelbot.log'),
+            maxBytes=1024 * 1024,  # 1MB
+            backupCount=5
+        )
+        file_handler.setFormatter(formatter)
+        return [console_handler, file_handler]
+
+    def configure(self, level=LOG_LEVEL, fmt=LOG_FORMAT, directory=LOG_DIR,
+                  use_queue=ASYNC_LOGGING, queue_size=LOG_QUEUE_SIZE):
+        """
+        (Re)build the pipeline and apply it to every logger created so far.
+
+        Args:
+            level (str): Minimum level logged, e.g. 'INFO'
+            fmt (str): 'text' or 'json'
+            directory (str): Directory of the rotating log file
+            use_queue (bool): Write from a background thread
+            queue_size (int): Records buffered before new ones are dropped
+        """
+        self.stop()
+        self._settings = (level, fmt, directory, use_queue, queue_size)
+        self.level = logging.getLevelName(level.upper()) if isinstance(level, str) else level
+
+        outputs = self._output_handlers(fmt, directory)
+        if use_queue:
+            handler = NonBlockingQueueHandler(queue.Queue(queue_size))
+            self.listener = QueueListener(handler.queue, *outputs, respect_handler_level=True)
+            self.listener.start()
+            self.handlers = [handler]
+        else:
+            self.handlers = outputs
+        for handler in self.handlers:
+            handler.addFilter(ContextFilter())
+
+        for logger in self._loggers:
+            self._apply(logger)
+
+    def _apply(self, logger):
+        logger.setLevel(self.level)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        for handler in self.handlers:
+            logger.addHandler(handler)
+
+    def attach(self, logger):
+        if self._settings is None:
+            self.configure()
+        self._loggers.add(logger)
+        self._apply(logger)
+
+    def flush(self):
+        """
+        Wait until the queued records are written, for processes that exit
+        without running atexit handlers.
+        """
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener.start()
+
+    def stop(self):
+        """
+        Write the queued records and close the output handlers.
+        """
+        handlers = self.handlers
+        if self.listener is not None:
+            self.listener.stop()
+            handlers = self.listener.handlers
+            self.listener = None
+        for handler in handlers:
+            handler.close()
+
+    def _after_fork(self):
+        # The listener thread does not survive a fork, so the child (e.g. a
+        # Celery prefork worker) starts its own queue and listener
+        if self.listener is not None:
+            # Its thread is gone, stopping it would wait forever
+            outputs, self.listener = self.listener.handlers, None
+            for handler in outputs:
+                handler.close()
+            self.configure(*self._settings)
+
+
+# Create a global instance of LoggingPipeline
+logging_pipeline = LoggingPipeline()
+atexit.register(logging_pipeline.stop)
+os.register_at_fork(after_in_child=logging_pipeline._after_fork)
+
 
 def setup_logger(name):
     """
@@ -14,38 +214,10 @@ def setup_logger(name):
     """
     # Create the logger
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
-    
+
     # Prevent propagation to root logger to avoid duplicates
     logger.propagate = False
 
-    # Avoid duplicate handlers
-    if logger.handlers:
-        return logger
-
-    # Create the logs directory if it doesn't exist
-    log_dir = 'logs'
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    
-    # Configure the format
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-
-    # Handler for console
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.DEBUG)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-
-    # Handler for file
-    file_handler = RotatingFileHandler(
-        filename=os.path.join(log_dir, 'padelbot.log'),
-        maxBytes=1024 * 1024,  # 1MB
-        backupCount=5
-    )
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    
-    return logger 
\ No newline at end of file
+    # Every module logger shares the pipeline's handlers
+    logging_pipeline.attach(logger)
+    return logger
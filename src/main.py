@@ -1,6 +1,8 @@
 import asyncio
 from src.logger import setup_logger
-from src.telegram_bot import TelegramBot
+from src.config import BOT_METRICS_PORT
+from src.metrics import start_metrics_server
+from src.telegram_bot import get_telegram_bot
 from telegram import Update
 
 logger = setup_logger(__name__)
@@ -18,9 +20,12 @@ def main():
     try:
         logger.info("Initializing Telegram bot...")
         # Initialize the Telegram notifier
-        telegram_bot = TelegramBot()
+        telegram_bot = get_telegram_bot()
         logger.info("Telegram bot initialized successfully")
 
+        # Expose the bot metrics (DB lookups, Telegram sends)
+        start_metrics_server(BOT_METRICS_PORT)
+
         logger.info("Starting bot polling...")
         # Start the bot (this will block until the bot is stopped)
         telegram_bot.application.run_polling(allowed_updates=Update.ALL_TYPES)
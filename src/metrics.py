@@ -0,0 +1,136 @@
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, start_http_server
+)
+from prometheus_client import multiprocess
+
+from src.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Seconds, from in-memory parsing up to slow page loads
+PHASE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80)
+
+PHASE_DURATION = Histogram(
+    'padelbot_phase_duration_seconds',
+    'Duration of each pipeline phase',
+    ['phase'],
+    buckets=PHASE_BUCKETS
+)
+
+PHASE_ERRORS = Counter(
+    'padelbot_phase_errors_total',
+    'Errors raised or reported by each pipeline phase',
+    ['phase']
+)
+
+SLOT_CHANGES = Counter(
+    'padelbot_slot_changes_total',
+    'Slots added or removed by the scrapes',
+    ['venue', 'change']
+)
+
+SCRAPE_TRANSFER_BYTES = Histogram(
+    'padelbot_scrape_transfer_bytes',
+    'Bytes transferred by the browser per scrape',
+    ['venue'],
+    buckets=(50e3, 100e3, 250e3, 500e3, 1e6, 2.5e6, 5e6, 10e6, 25e6)
+)
+
+BLOCKED_REQUESTS = Counter(
+    'padelbot_blocked_requests_total',
+    'Browser requests blocked by the block profile',
+    ['venue']
+)
+
+SCRAPES_SKIPPED = Counter(
+    'padelbot_scrapes_skipped_total',
+    'Scrape runs skipped because another run of the venue was in flight',
+    ['venue']
+)
+
+SCRAPES_TIMED_OUT = Counter(
+    'padelbot_scrapes_timed_out_total',
+    'Scrape runs aborted at the soft time limit',
+    ['venue']
+)
+
+AVAILABILITY_CACHE_LOOKUPS = Counter(
+    'padelbot_availability_cache_lookups_total',
+    'Availability cache lookups by result',
+    ['result']
+)
+
+NOTIFICATIONS = Counter(
+    'padelbot_notifications_total',
+    'Telegram notifications by outcome',
+    ['result']
+)
+
+NOTIFICATION_QUEUE_DEPTH = Gauge(
+    'padelbot_notification_queue_depth',
+    'Telegram messages queued and not yet sent or given up',
+    multiprocess_mode='livesum'
+)
+
+
+@contextmanager
+def timed(phase):
+    """
+    Time a block as a pipeline phase, counting an error if it raises.
+
+    Args:
+        phase (str): Phase label, e.g. 'page_load' or 'save_slots'
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        PHASE_ERRORS.labels(phase=phase).inc()
+        raise
+    finally:
+        PHASE_DURATION.labels(phase=phase).observe(time.perf_counter() - start)
+
+
+def observe(phase, seconds):
+    """Record a duration measured elsewhere"""
+    PHASE_DURATION.labels(phase=phase).observe(seconds)
+
+
+def record_error(phase):
+    """Count an error a phase handled without raising"""
+    PHASE_ERRORS.labels(phase=phase).inc()
+
+
+def start_metrics_server(port):
+    """
+    Expose the metrics in Prometheus format on a local HTTP port.
+
+    When PROMETHEUS_MULTIPROC_DIR is set (Celery prefork workers) the
+    values written by every child process are aggregated.
+
+    Args:
+        port (int): Port to listen on, 0 disables the endpoint
+    """
+    if not port:
+        return
+
+    registry = REGISTRY
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+
+    try:
+        start_http_server(port, registry=registry)
+        logger.info(f"Metrics endpoint listening on port {port}")
+    except OSError as e:
+        logger.error(f"Could not start metrics endpoint on port {port}: {str(e)}")
+
+
+def mark_process_dead(pid):
+    """Drop the live values of an exited worker child in multiprocess mode"""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import OrderedDict
+
+from src.logger import setup_logger
+from src.config import NOTIFICATION_DEDUP_TTL, NOTIFICATION_DEDUP_MAX_SLOTS
+from src.redis_client import get_redis
+from src.database.models.available_slots_model import DEFAULT_VENUE
+
+logger = setup_logger(__name__)
+
+KEY_PREFIX = 'padelbot:notified:'
+
+
+def slot_key(day, hour, court, venue=DEFAULT_VENUE):
+    return f"{venue}|{day}|{hour}|{court}"
+
+
+class InMemoryDedupStore:
+    """
+    LRU of slot -> chats the slot is reserved for, with a TTL per slot.
+    """
+
+    def __init__(self, ttl, max_slots):
+        self.ttl = ttl
+        self.max_slots = max_slots
+        # slot key -> (expires_at, {chat_id: token})
+        self._slots = OrderedDict()
+        # Failed sends are released from the dispatcher thread
+        self._lock = threading.Lock()
+
+    def _chats(self, key, now):
+        entry = self._slots.get(key)
+        if entry is None:
+            return None
+        expires_at, chats = entry
+        if expires_at <= now:
+            del self._slots[key]
+            return None
+        return chats
+
+    def reserve(self, chat_id, keys, token):
+        now = time.monotonic()
+        reserved = []
+        with self._lock:
+            for key in keys:
+                chats = self._chats(key, now)
+                if chats is None:
+                    chats = {}
+                holder = chats.get(chat_id)
+                if holder is None:
+                    chats[chat_id] = token
+                    self._slots[key] = (now + self.ttl, chats)
+                    self._slots.move_to_end(key)
+                reserved.append(holder is None or holder == token)
+
+            # Evict the least recently reserved slots
+            while len(self._slots) > self.max_slots:
+                self._slots.popitem(last=False)
+        return reserved
+
+    def release(self, chat_id, keys, token):
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                chats = self._chats(key, now)
+                if chats is not None and chats.get(chat_id) == token:
+                    del chats[chat_id]
+
+    def forget(self, keys):
+        with self._lock:
+            for key in keys:
+                self._slots.pop(key, None)
+
+
+# Reserve a slot for a chat unless another token holds it, atomically per slot.
+# KEYS: slot hashes, ARGV: chat ID, token, TTL. Returns 1 per slot reserved for the token
+RESERVE_SCRIPT = """
+local reserved = {}
+for i, key in ipairs(KEYS) do
+    local holder = redis.call('HGET', key, ARGV[1])
+    if not holder then
+        redis.call('HSET', key, ARGV[1], ARGV[2])
+        redis.call('EXPIRE', key, ARGV[3])
+        reserved[i] = 1
+    elseif holder == ARGV[2] then
+        reserved[i] = 1
+    else
+        reserved[i] = 0
+    end
+end
+return reserved
+"""
+
+# Drop the reservations of a chat that are still held by the token
+RELEASE_SCRIPT = """
+for _, key in ipairs(KEYS) do
+    if redis.call('HGET', key, ARGV[1]) == ARGV[2] then
+        redis.call('HDEL', key, ARGV[1])
+    end
+end
+return 0
+"""
+
+
+class RedisDedupStore:
+    """
+    One Redis hash of chat -> reserving token per slot, expiring after the TTL.
+    """
+
+    def __init__(self, client, ttl):
+        self.client = client
+        self.ttl = ttl
+        self._reserve = client.register_script(RESERVE_SCRIPT)
+        self._release = client.register_script(RELEASE_SCRIPT)
+
+    def reserve(self, chat_id, keys, token):
+        reserved = self._reserve(keys=[KEY_PREFIX + key for key in keys], args=[chat_id, token, self.ttl])
+        return [bool(flag) for flag in reserved]
+
+    def release(self, chat_id, keys, token):
+        self._release(keys=[KEY_PREFIX + key for key in keys], args=[chat_id, token])
+
+    def forget(self, keys):
+        if keys:
+            self.client.delete(*[KEY_PREFIX + key for key in keys])
+
+
+class NotificationDedup:
+    """
+    Remembers which (chat_id, day, hour, court) were already notified so only
+    newly available slots are sent. Slots are reserved before they are sent
+    and released if the send fails. Backed by Redis when reachable and by an
+    in-process LRU otherwise.
+    """
+
+    def __init__(self, ttl=NOTIFICATION_DEDUP_TTL, max_slots=NOTIFICATION_DEDUP_MAX_SLOTS):
+        self.ttl = ttl
+        self.max_slots = max_slots
+        self._store = None
+
+    @property
+    def store(self):
+        # The in-process fallback is replaced once Redis becomes reachable
+        if not isinstance(self._store, RedisDedupStore):
+            client = get_redis()
+            if client is not None:
+                self._store = RedisDedupStore(client, self.ttl)
+            elif self._store is None:
+                self._store = InMemoryDedupStore(self.ttl, self.max_slots)
+        return self._store
+
+    @staticmethod
+    def _key(slot):
+        return slot_key(slot['fecha'], slot['hora'], slot['cancha'], slot.get('sede', DEFAULT_VENUE))
+
+    def reserve(self, chat_id, slots, token):
+        """
+        Reserve the slots not yet notified to a chat. A slot is reserved for
+        one token at a time, so concurrent runs never both send it.
+
+        Args:
+            chat_id (int | str): Target chat ID
+            slots (list): List of {'fecha', 'hora', 'cancha', 'sede'} dicts
+            token (str): ID of the run reserving the slots
+
+        Returns:
+            list: Slots never notified to the chat within the TTL, or already
+                  reserved by the same token
+        """
+        if not slots:
+            return []
+        keys = [self._key(slot) for slot in slots]
+        reserved = self.store.reserve(str(chat_id), keys, token)
+        return [slot for slot, ok in zip(slots, reserved) if ok]
+
+    def release(self, chat_id, slots, token):
+        """
+        Give back slots whose notification failed, so they are sent again.
+        Slots reserved by another token are left alone.
+
+        Args:
+            chat_id (int | str): Target chat ID
+            slots (list): List of {'fecha', 'hora', 'cancha', 'sede'} dicts
+            token (str): ID of the run that reserved the slots
+        """
+        if slots:
+            keys = [self._key(slot) for slot in slots]
+            self.store.release(str(chat_id), keys, token)
+
+    def forget(self, slots):
+        """
+        Forget slots that were taken, so they are notified again if they reopen.
+
+        Args:
+            slots (list): List of {'day', 'hour', 'court', 'venue'} dicts
+        """
+        if slots:
+            self.store.forget([
+                slot_key(slot['day'], slot['hour'], slot['court'], slot.get('venue', DEFAULT_VENUE))
+                for slot in slots
+            ])
+
+
+# Create a global instance of NotificationDedup for this process
+notification_dedup = NotificationDedup()
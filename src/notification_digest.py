@@ -0,0 +1,107 @@
+import uuid
+
+from src.logger import setup_logger
+from src.database.formats import parse_day
+from src.database.models.available_slots_model import DEFAULT_VENUE
+from src.notification_dedup import notification_dedup, slot_key
+from src.notification_dispatcher import notification_dispatcher
+
+logger = setup_logger(__name__)
+
+# Slots notified per subscription, as before digests
+SLOTS_PER_SUBSCRIPTION = 3
+
+
+def _sort_key(slot):
+    return parse_day(slot['fecha']), slot['hora'], slot.get('sede', DEFAULT_VENUE), slot['cancha']
+
+
+class NotificationDigest:
+    """
+    Collects the notifications of one sweep per chat, so a chat with several
+    subscriptions gets a single digest. Slots matched by overlapping
+    subscription windows are only listed once.
+    """
+
+    def __init__(self, slots_per_subscription=SLOTS_PER_SUBSCRIPTION):
+        self.slots_per_subscription = slots_per_subscription
+        # chat_id -> slot key -> slot, in insertion order
+        self._chats = {}
+        # chat_id -> slot key -> reserved slot left out by the per-subscription cap
+        self._held_back = {}
+        self.subscriptions = 0
+        # Dedup reservations of this digest
+        self.token = uuid.uuid4().hex
+
+    def add(self, subscription, available_slots):
+        """
+        Add the first slots of a subscription not yet notified to its chat.
+
+        Every matched slot not yet notified is reserved, including the ones
+        past the cap, so a later run does not send them as new.
+
+        Args:
+            subscription (Subscription | SubscriptionRule): Matched subscription
+            available_slots (list): List of {'fecha', 'hora', 'cancha', 'sede'} dicts
+        """
+        # Skip the slots this chat was already notified about or another run is sending
+        new_slots = notification_dedup.reserve(subscription.chat_id, available_slots, self.token)
+        if not new_slots:
+            logger.debug("Slots for %r already notified", subscription)
+            return
+
+        chat_slots = self._chats.setdefault(subscription.chat_id, {})
+        held_back = self._held_back.setdefault(subscription.chat_id, {})
+        for i, slot in enumerate(new_slots):
+            key = slot_key(slot['fecha'], slot['hora'], slot['cancha'], slot.get('sede', DEFAULT_VENUE))
+            if i < self.slots_per_subscription:
+                chat_slots.setdefault(key, slot)
+            else:
+                held_back.setdefault(key, slot)
+        self.subscriptions += 1
+
+    def send(self, telegram_bot):
+        """
+        Queue one digest per chat, split on Telegram's message size limit.
+        The slots of a failed message are released so the next run sends them again.
+
+        Args:
+            telegram_bot (TelegramBot): Bot used to build the messages
+
+        Returns:
+            int: Number of queued messages
+        """
+        sent = 0
+        for chat_id, chat_slots in self._chats.items():
+            slots = sorted(chat_slots.values(), key=_sort_key)
+            held_back = [slot for key, slot in self._held_back.get(chat_id, {}).items() if key not in chat_slots]
+            groups = telegram_bot.split_slots(slots)
+            logger.info(f"Notifying {len(slots)} slots to chat_id {chat_id} in {len(groups)} messages")
+            for i, group in enumerate(groups):
+                # The held back slots are given back with the first message if it fails
+                reserved = group + held_back if i == 0 else group
+                notification_dispatcher.submit(
+                    chat_id, telegram_bot.create_message(group), _on_result(chat_id, reserved, self.token)
+                )
+            sent += len(groups)
+
+        if self.subscriptions:
+            logger.info(f"Digest: {self.subscriptions} matched subscriptions, "
+                        f"{len(self._chats)} chats, {sent} messages")
+        self._chats.clear()
+        self._held_back.clear()
+        self.subscriptions = 0
+        self.token = uuid.uuid4().hex
+        return sent
+
+
+def _on_result(chat_id, slots, token):
+    """
+    Build the dispatcher callback of one message: the reserved slots stay
+    notified when it was delivered, and are released when it failed so the
+    next run retries them.
+    """
+    def on_result(delivered):
+        if not delivered:
+            notification_dedup.release(chat_id, slots, token)
+    return on_result
@@ -0,0 +1,268 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+from datetime import timedelta
+
+from src.logger import setup_logger
+from src.metrics import NOTIFICATIONS, NOTIFICATION_QUEUE_DEPTH, observe, record_error
+from src.config import (
+    TELEGRAM_BOT_TOKEN, TELEGRAM_API_URL, TELEGRAM_GLOBAL_RATE, TELEGRAM_CHAT_RATE,
+    NOTIFICATION_CONCURRENCY, NOTIFICATION_MAX_RETRIES, NOTIFICATION_FLUSH_TIMEOUT
+)
+
+logger = setup_logger(__name__)
+
+# Seconds between two prunes of the idle per-chat buckets
+BUCKET_PRUNE_INTERVAL = 60
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter, only used from the dispatcher event loop.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        """
+        Wait until a token is available and take it.
+        """
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def is_full(self, now):
+        """
+        Returns:
+            bool: True once the bucket refilled to capacity, it then behaves like a new one
+        """
+        return self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+
+class NotificationDispatcher:
+    """
+    Queues outgoing Telegram messages and sends them concurrently from a
+    single long-lived event loop running in a background thread.
+
+    Sends respect a global token bucket and one bucket per chat, and flood
+    control errors (RetryAfter) are retried after the delay Telegram asks for.
+    """
+
+    def __init__(self, token=TELEGRAM_BOT_TOKEN, base_url=TELEGRAM_API_URL,
+                 global_rate=TELEGRAM_GLOBAL_RATE, chat_rate=TELEGRAM_CHAT_RATE,
+                 concurrency=NOTIFICATION_CONCURRENCY, max_retries=NOTIFICATION_MAX_RETRIES):
+        self.token = token
+        self.base_url = base_url
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+
+        self.loop = None
+        self.queue = None
+        self.bot = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._global_bucket = None
+        self._chat_buckets = {}
+        self._pruned_at = 0
+
+        self.submitted = 0
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.started_at = None
+
+    def start(self):
+        """
+        Start the event loop thread and the sender tasks, once per process.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self.loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run_loop, args=(ready,), name='notification-dispatcher', daemon=True
+            )
+            self._thread.start()
+            ready.wait()
+            self.started_at = time.monotonic()
+            logger.info(f"Notification dispatcher started with {self.concurrency} senders")
+
+    def _run_loop(self, ready):
+        # python-telegram-bot is imported with the first message, not at worker boot
+        from telegram import Bot
+        from telegram.request import HTTPXRequest
+
+        asyncio.set_event_loop(self.loop)
+        self.queue = asyncio.Queue()
+        self.bot = Bot(
+            token=self.token,
+            base_url=self.base_url,
+            request=HTTPXRequest(connection_pool_size=self.concurrency)
+        )
+        self._global_bucket = TokenBucket(self.global_rate, self.global_rate)
+        self._chat_buckets = {}
+        self._pruned_at = time.monotonic()
+        for _ in range(self.concurrency):
+            self.loop.create_task(self._sender())
+        self.loop.call_soon(ready.set)
+        self.loop.run_forever()
+
+    def _chat_bucket(self, chat_id):
+        now = time.monotonic()
+        if now - self._pruned_at >= BUCKET_PRUNE_INTERVAL:
+            self._prune_buckets(now)
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, 1)
+        return bucket
+
+    def _prune_buckets(self, now):
+        # Drop the buckets of idle chats, otherwise one is kept per chat ever notified
+        self._chat_buckets = {
+            chat_id: bucket for chat_id, bucket in self._chat_buckets.items() if not bucket.is_full(now)
+        }
+        self._pruned_at = now
+
+    async def _sender(self):
+        while True:
+            chat_id, message, on_result = await self.queue.get()
+            NOTIFICATION_QUEUE_DEPTH.dec()
+            try:
+                sent = await self._send(chat_id, message)
+            except Exception as e:
+                # A bad message must not stop this sender for the next ones
+                sent = False
+                record_error('telegram_send')
+                NOTIFICATIONS.labels(result='failed').inc()
+                self.failed += 1
+                logger.error(f"Unexpected error sending notification to chat {chat_id}: {str(e)}")
+            finally:
+                self.queue.task_done()
+
+            if on_result is not None:
+                try:
+                    on_result(sent)
+                except Exception as e:
+                    logger.error(f"Error in notification result callback for chat {chat_id}: {str(e)}")
+
+    async def _send(self, chat_id, message):
+        """
+        Returns:
+            bool: True if Telegram accepted the message
+        """
+        from telegram.error import RetryAfter, TelegramError
+
+        for attempt in range(self.max_retries + 1):
+            await self._chat_bucket(chat_id).acquire()
+            await self._global_bucket.acquire()
+            start = time.perf_counter()
+            try:
+                await self.bot.send_message(
+                    chat_id=chat_id,
+                    text=message,
+                    parse_mode='HTML',
+                    disable_notification=False
+                )
+                observe('telegram_send', time.perf_counter() - start)
+                NOTIFICATIONS.labels(result='sent').inc()
+                self.sent += 1
+                logger.info(f"Notification successfully sent to chat {chat_id}")
+                return True
+            except RetryAfter as e:
+                retry_after = e.retry_after
+                if isinstance(retry_after, timedelta):
+                    retry_after = retry_after.total_seconds()
+                if attempt == self.max_retries:
+                    break
+                self.retried += 1
+                NOTIFICATIONS.labels(result='retried').inc()
+                logger.warning(f"Flood control for chat {chat_id}, retrying in {retry_after}s")
+                await asyncio.sleep(retry_after)
+            except TelegramError as e:
+                record_error('telegram_send')
+                NOTIFICATIONS.labels(result='failed').inc()
+                self.failed += 1
+                logger.error(f"Error sending notification to chat {chat_id}: {str(e)}")
+                return False
+
+        NOTIFICATIONS.labels(result='failed').inc()
+        self.failed += 1
+        logger.error(f"Giving up notification to chat {chat_id} after {self.max_retries} retries")
+        return False
+
+    def submit(self, chat_id, message, on_result=None):
+        """
+        Queue a message for a chat, returns immediately.
+
+        Args:
+            chat_id (int): Target chat ID
+            message (str): HTML message to send
+            on_result (callable, optional): Called with True once Telegram accepted
+                the message, or False once it was given up, from the dispatcher thread
+        """
+        self.start()
+        self.submitted += 1
+        NOTIFICATION_QUEUE_DEPTH.inc()
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, (chat_id, message, on_result))
+
+    def flush(self, timeout=NOTIFICATION_FLUSH_TIMEOUT):
+        """
+        Block until every queued message was sent or given up.
+
+        Args:
+            timeout (float, optional): Seconds to wait, None waits forever
+
+        Returns:
+            bool: False if messages were still queued after the timeout
+        """
+        if self.loop is None:
+            return True
+        future = asyncio.run_coroutine_threadsafe(self.queue.join(), self.loop)
+        try:
+            future.result(timeout)
+            flushed = True
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            flushed = False
+
+        stats = self.stats()
+        if not flushed:
+            logger.warning(f"Notifications not flushed after {timeout}s, "
+                           f"{stats['queue_depth']} still queued")
+        logger.info(f"Notifications flushed: {stats['sent']} sent, {stats['failed']} failed, "
+                    f"{stats['retried']} retried, {stats['queue_depth']} queued, "
+                    f"{stats['throughput']:.1f} msg/s")
+        return flushed
+
+    def stats(self):
+        """
+        Returns:
+            dict: Counters, current queue depth and average throughput
+        """
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0
+        return {
+            'submitted': self.submitted,
+            'sent': self.sent,
+            'failed': self.failed,
+            'retried': self.retried,
+            'queue_depth': self.queue.qsize() if self.queue is not None else 0,
+            'throughput': self.sent / elapsed if elapsed else 0.0,
+        }
+
+
+# Create a global instance of NotificationDispatcher for this process
+notification_dispatcher = NotificationDispatcher()
@@ -0,0 +1,129 @@
+import time
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from src.logger import setup_logger
+from src.config import READY_TIMEOUT, NETWORK_IDLE_TIME
+from src.calendar_parser import CELL_CLASS, DATE_LABEL_SELECTOR
+
+logger = setup_logger(__name__)
+
+# Count of finished network requests, used to detect network idle
+NETWORK_STATE_SCRIPT = (
+    "return [document.readyState, performance.getEntriesByType('resource').length];"
+)
+
+
+class PageReadiness:
+    """
+    Waits on concrete page signals instead of fixed sleeps and records how
+    long every wait took.
+    """
+
+    def __init__(self, driver, timeout=READY_TIMEOUT, poll_frequency=0.1,
+                 cell_class=CELL_CLASS, date_label_selector=DATE_LABEL_SELECTOR):
+        self.driver = driver
+        self.cell_class = cell_class
+        self.date_label_selector = date_label_selector
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.waits = []
+
+    def _wait(self, step, condition, timeout=None):
+        """
+        Wait until a condition holds and record the duration.
+
+        Args:
+            step (str): Name of the wait, used in the recorded durations
+            condition (callable): Condition receiving the driver
+            timeout (float, optional): Seconds before giving up
+
+        Returns:
+            bool: True if the condition was met before the timeout
+        """
+        start = time.perf_counter()
+        try:
+            WebDriverWait(
+                self.driver,
+                timeout or self.timeout,
+                poll_frequency=self.poll_frequency
+            ).until(condition)
+            ready = True
+        except TimeoutException:
+            logger.warning(f"Timed out waiting for {step}")
+            ready = False
+
+        self.waits.append((step, time.perf_counter() - start, ready))
+        return ready
+
+    def wait_for_calendar(self, timeout=None):
+        """
+        Wait until the calendar slot cells are present.
+        """
+        return self._wait(
+            'calendar',
+            lambda driver: driver.find_elements(By.CLASS_NAME, self.cell_class),
+            timeout
+        )
+
+    def wait_for_network_idle(self, idle_time=NETWORK_IDLE_TIME, timeout=None):
+        """
+        Wait until the document is loaded and no request finished for `idle_time` seconds.
+        """
+        state = {'count': None, 'since': time.perf_counter()}
+
+        def network_idle(driver):
+            ready_state, count = driver.execute_script(NETWORK_STATE_SCRIPT)
+            now = time.perf_counter()
+            if count != state['count']:
+                state['count'], state['since'] = count, now
+                return False
+            return ready_state == 'complete' and now - state['since'] >= idle_time
+
+        return self._wait('network_idle', network_idle, timeout)
+
+    def day_marker(self):
+        """
+        Capture what identifies the day currently displayed.
+
+        Returns:
+            tuple: (date label text or None, first calendar cell or None)
+        """
+        labels = self.driver.find_elements(By.CSS_SELECTOR, self.date_label_selector)
+        cells = self.driver.find_elements(By.CLASS_NAME, self.cell_class)
+        return (labels[0].text if labels else None, cells[0] if cells else None)
+
+    def wait_for_day_change(self, marker, timeout=None):
+        """
+        Wait until the date label changes or the previous calendar is replaced.
+
+        Args:
+            marker (tuple): Value returned by `day_marker` before the click
+        """
+        previous_label, previous_cell = marker
+
+        def day_changed(driver):
+            if previous_label is not None:
+                labels = driver.find_elements(By.CSS_SELECTOR, self.date_label_selector)
+                if labels and labels[0].text != previous_label:
+                    return True
+            if previous_cell is not None:
+                try:
+                    previous_cell.is_enabled()
+                except StaleElementReferenceException:
+                    return True
+            return False
+
+        return self._wait('day_change', day_changed, timeout)
+
+    def summary(self):
+        """
+        Returns:
+            str: Recorded wait durations, for logging
+        """
+        return ', '.join(
+            f"{step}={seconds:.2f}s{'' if ready else ' (timeout)'}"
+            for step, seconds, ready in self.waits
+        )
@@ -0,0 +1,44 @@
+import time
+
+import redis
+
+from src.logger import setup_logger
+from src.config import REDIS_URL, REDIS_RETRY_INTERVAL
+
+logger = setup_logger(__name__)
+
+_client = None
+# Monotonic time of the last failed connection attempt
+_failed_at = None
+
+
+def get_redis():
+    """
+    Get the Redis client shared by this process, if Redis is reachable.
+    After a failed connection, Redis is tried again once REDIS_RETRY_INTERVAL
+    passed, so a short outage does not disable it for the process lifetime.
+
+    Returns:
+        redis.Redis: Connected client, or None when Redis is unavailable
+    """
+    global _client, _failed_at
+    if _client is not None:
+        return _client
+    if _failed_at is not None and time.monotonic() - _failed_at < REDIS_RETRY_INTERVAL:
+        return None
+
+    try:
+        client = redis.Redis.from_url(REDIS_URL, socket_connect_timeout=2, socket_timeout=2)
+        client.ping()
+    except Exception as e:
+        if _failed_at is None:
+            logger.warning(f"Redis unavailable, using in-process fallbacks: {str(e)}")
+        else:
+            logger.debug(f"Redis still unavailable: {str(e)}")
+        _failed_at = time.monotonic()
+        return None
+
+    if _failed_at is not None:
+        logger.info("Redis reachable again, leaving the in-process fallbacks")
+    _client, _failed_at = client, None
+    return _client
@@ -0,0 +1,114 @@
+import json
+
+from src.logger import setup_logger
+from src.config import BLOCK_PROFILE, BLOCKED_URL_PATTERNS
+
+logger = setup_logger(__name__)
+
+TRACKER_PATTERNS = [
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*doubleclick.net*',
+    '*facebook.net*',
+    '*facebook.com/tr*',
+    '*hotjar.com*',
+    '*clarity.ms*',
+    '*segment.io*',
+    '*sentry.io*',
+    '*intercom.io*',
+]
+
+IMAGE_PATTERNS = ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.svg*', '*.ico*', '*.avif*']
+MEDIA_PATTERNS = ['*.mp4*', '*.webm*', '*.mp3*']
+FONT_PATTERNS = ['*.woff*', '*.ttf*', '*.otf*', '*.eot*']
+STYLESHEET_PATTERNS = ['*.css*']
+
+# Requests blocked through CDP Network.setBlockedURLs, and whether images are
+# also blocked by resource type through the Chrome content settings
+BLOCK_PROFILES = {
+    'off': {'patterns': [], 'block_images': False},
+    'light': {'patterns': TRACKER_PATTERNS + IMAGE_PATTERNS + MEDIA_PATTERNS, 'block_images': True},
+    'aggressive': {
+        'patterns': TRACKER_PATTERNS + IMAGE_PATTERNS + MEDIA_PATTERNS + FONT_PATTERNS + STYLESHEET_PATTERNS,
+        'block_images': True,
+    },
+}
+
+
+def get_block_profile(name=BLOCK_PROFILE):
+    """
+    Returns:
+        dict: The named profile with the extra BLOCKED_URL_PATTERNS appended
+
+    Raises:
+        ValueError: If the profile does not exist
+    """
+    if name not in BLOCK_PROFILES:
+        raise ValueError(f"Unknown block profile: {name} (expected one of {', '.join(BLOCK_PROFILES)})")
+    profile = BLOCK_PROFILES[name]
+    return {
+        'name': name,
+        'patterns': profile['patterns'] + BLOCKED_URL_PATTERNS,
+        'block_images': profile['block_images'],
+    }
+
+
+def apply_blocking(driver, profile):
+    """
+    Block the profile's URL patterns in a browser session via CDP.
+    The block list lasts for the whole session, across page loads.
+
+    Args:
+        driver (webdriver.Chrome): Driver to configure
+        profile (dict): Profile returned by `get_block_profile`
+    """
+    if not profile['patterns']:
+        return
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': profile['patterns']})
+    logger.info(f"Blocking {len(profile['patterns'])} URL patterns (profile {profile['name']})")
+
+
+# Navigation timing of the current document, in milliseconds since navigation start
+NAVIGATION_TIMING_SCRIPT = """
+const entry = performance.getEntriesByType('navigation')[0];
+return entry ? [entry.domContentLoadedEventEnd, entry.loadEventEnd] : [0, 0];
+"""
+
+
+def reset_network_log(driver):
+    """
+    Drop the performance log buffered since the last read, so the next
+    `page_stats` only covers the current scrape.
+    """
+    try:
+        driver.get_log('performance')
+    except Exception as e:
+        logger.debug(f"Performance log unavailable: {str(e)}")
+
+
+def page_stats(driver):
+    """
+    Summarize the network activity since the last read of the performance log.
+
+    Returns:
+        dict: DOMContentLoaded and load times (ms), transferred bytes,
+            finished and blocked requests
+    """
+    stats = {'dom_content_loaded_ms': 0.0, 'load_ms': 0.0, 'bytes': 0, 'requests': 0, 'blocked': 0}
+    try:
+        stats['dom_content_loaded_ms'], stats['load_ms'] = driver.execute_script(NAVIGATION_TIMING_SCRIPT)
+        entries = driver.get_log('performance')
+    except Exception as e:
+        logger.debug(f"Could not read page stats: {str(e)}")
+        return stats
+
+    for entry in entries:
+        message = json.loads(entry['message'])['message']
+        method = message.get('method')
+        if method == 'Network.loadingFinished':
+            stats['bytes'] += int(message['params'].get('encodedDataLength', 0))
+            stats['requests'] += 1
+        elif method == 'Network.loadingFailed' and message['params'].get('blockedReason'):
+            stats['blocked'] += 1
+    return stats
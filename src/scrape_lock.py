@@ -0,0 +1,130 @@
+import fcntl
+import os
+import uuid
+from contextlib import contextmanager
+
+from src.logger import setup_logger
+from src.config import SCRAPE_LOCK_DIR, SCRAPE_TIME_LIMIT
+from src.redis_client import get_redis
+
+logger = setup_logger(__name__)
+
+KEY_PREFIX = 'padelbot:scrape-lock:'
+
+# Delete the lock only while it still holds our token, so a run that outlived
+# its lock never releases the lock of the next run
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Seconds a lock outlives the hard time limit, in case the holder is killed
+LOCK_TTL_MARGIN = 30
+
+
+class RedisLockStore:
+    """
+    One expiring Redis key per venue, set only if absent and tagged with the
+    holder's token.
+    """
+
+    def __init__(self, client, ttl):
+        self.client = client
+        self.ttl = ttl
+        self._release = client.register_script(RELEASE_SCRIPT)
+
+    def acquire(self, name):
+        token = uuid.uuid4().hex
+        if self.client.set(KEY_PREFIX + name, token, nx=True, px=int(self.ttl * 1000)):
+            return token
+        return None
+
+    def release(self, name, token):
+        self._release(keys=[KEY_PREFIX + name], args=[token])
+
+
+class FileLockStore:
+    """
+    One flock'ed file per venue. The kernel drops the lock when the holder
+    exits, but it only covers the workers of a single host.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def acquire(self, name):
+        os.makedirs(self.directory, exist_ok=True)
+        fd = os.open(os.path.join(self.directory, f"{name}.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+
+    def release(self, name, fd):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+class ScrapeLock:
+    """
+    Keeps at most one scrape per venue in flight across the workers. Backed
+    by Redis when reachable and by lock files otherwise.
+    """
+
+    def __init__(self, ttl=SCRAPE_TIME_LIMIT + LOCK_TTL_MARGIN, directory=SCRAPE_LOCK_DIR):
+        self.ttl = ttl
+        self.directory = directory
+        self._store = None
+
+    @property
+    def store(self):
+        # The file fallback is replaced once Redis becomes reachable
+        if not isinstance(self._store, RedisLockStore):
+            client = get_redis()
+            if client is not None:
+                self._store = RedisLockStore(client, self.ttl)
+            elif self._store is None:
+                self._store = FileLockStore(self.directory)
+        return self._store
+
+    @contextmanager
+    def hold(self, venue):
+        """
+        Try to take the scrape lock of a venue without waiting.
+
+        Args:
+            venue (str): Venue slug
+
+        Yields:
+            bool: True if the lock was taken, False if another scrape holds it
+        """
+        store = self.store
+        try:
+            handle = store.acquire(venue)
+        except Exception as e:
+            # Never stop scraping because the lock backend failed
+            logger.warning(f"Could not take scrape lock for {venue}, using a lock file: {str(e)}")
+            store = FileLockStore(self.directory)
+            handle = store.acquire(venue)
+
+        if handle is None:
+            yield False
+            return
+
+        try:
+            yield True
+        finally:
+            try:
+                store.release(venue, handle)
+            except Exception as e:
+                logger.warning(f"Could not release scrape lock for {venue}: {str(e)}")
+
+
+# Create a global instance of ScrapeLock
+scrape_lock = ScrapeLock()
@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+from datetime import datetime
+
+from src.logger import setup_logger
+from src.config import (
+    SCRAPE_MIN_INTERVAL, SCRAPE_MAX_INTERVAL, SCRAPE_NIGHT_START, SCRAPE_NIGHT_END
+)
+from src.redis_client import get_redis
+
+logger = setup_logger(__name__)
+
+KEY_PREFIX = 'padelbot:schedule:'
+
+# Unchanged scrapes in a row that still double the interval
+MAX_BACKOFF_STEPS = 6
+
+# Extra backoff steps applied during the night hours
+NIGHT_BACKOFF_STEPS = 2
+
+
+def is_night(hour, start=SCRAPE_NIGHT_START, end=SCRAPE_NIGHT_END):
+    """
+    Check if an hour of the day falls in the night window, which may wrap midnight.
+    """
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+def choose_interval(base, demand, changed, unchanged_streak, night,
+                    min_interval=SCRAPE_MIN_INTERVAL, max_interval=SCRAPE_MAX_INTERVAL):
+    """
+    Pick the next scrape interval of a venue.
+
+    The interval doubles for every unchanged scrape in a row and during the
+    night, and halves when subscriptions target the next days or the last
+    scrape found changes. The result is clamped to [min_interval, max_interval].
+
+    Args:
+        base (float): Configured interval of the venue in minutes
+        demand (int): Subscriptions for the next days
+        changed (bool): Whether the last scrape changed the snapshot
+        unchanged_streak (int): Scrapes in a row without changes
+        night (bool): Whether it is night time
+
+    Returns:
+        tuple: (interval in minutes, reason)
+    """
+    steps = min(unchanged_streak, MAX_BACKOFF_STEPS)
+    reasons = []
+    if steps:
+        reasons.append(f"unchanged x{unchanged_streak}")
+    if night:
+        steps += NIGHT_BACKOFF_STEPS
+        reasons.append("night")
+    if demand:
+        steps -= 1
+        reasons.append(f"demand {demand}")
+    if changed:
+        steps -= 1
+        reasons.append("recent changes")
+
+    interval = base * 2 ** steps
+    clamped = min(max(interval, min_interval), max_interval)
+    if clamped != interval:
+        reasons.append(f"clamped from {interval:g}m")
+
+    return clamped, ', '.join(reasons) or 'base interval'
+
+
+class ScrapeScheduler:
+    """
+    Decides when each venue is scraped next.
+
+    The state of every venue (next run, last outcome and unchanged streak)
+    lives in Redis so the beat tick and the scrape workers share it, with an
+    in-process fallback when Redis is unavailable.
+    """
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def _load(self, slug):
+        client = get_redis()
+        if client is not None:
+            try:
+                raw = client.hgetall(KEY_PREFIX + slug)
+                return {key.decode(): json.loads(value) for key, value in raw.items()}
+            except Exception as e:
+                logger.warning(f"Could not read schedule state from Redis: {str(e)}")
+        return dict(self._states.get(slug, {}))
+
+    def _update(self, slug, fields):
+        # Only the given fields are written, the tick and the workers own different ones
+        client = get_redis()
+        if client is not None:
+            try:
+                client.hset(KEY_PREFIX + slug, mapping={key: json.dumps(value) for key, value in fields.items()})
+                return
+            except Exception as e:
+                logger.warning(f"Could not write schedule state to Redis: {str(e)}")
+        self._states.setdefault(slug, {}).update(fields)
+
+    def state(self, slug):
+        """
+        Returns:
+            dict: Schedule state of a venue, empty if it was never scheduled
+        """
+        return self._load(slug)
+
+    def due(self, venues, demand, now=None):
+        """
+        Select the venues whose next run is due and schedule the following one.
+
+        Args:
+            venues (iterable): Venue objects
+            demand (int): Subscriptions for the next days
+            now (float, optional): Current epoch time
+
+        Returns:
+            list: (venue, interval in minutes, reason) for every due venue
+        """
+        now = now if now is not None else time.time()
+        night = is_night(datetime.fromtimestamp(now).hour)
+        due = []
+
+        with self._lock:
+            for venue in venues:
+                state = self._load(venue.slug)
+                if now < state.get('next_run', 0):
+                    continue
+
+                interval, reason = choose_interval(
+                    venue.interval,
+                    demand,
+                    state.get('changed', False),
+                    state.get('unchanged_streak', 0),
+                    night
+                )
+                self._update(venue.slug, {
+                    'next_run': now + interval * 60, 'interval': interval, 'reason': reason
+                })
+                due.append((venue, interval, reason))
+
+        return due
+
+    def record_result(self, slug, changed):
+        """
+        Record the outcome of a scrape, used to pick the next interval.
+
+        Args:
+            slug (str): Scraped venue
+            changed (bool): Whether the scrape added or removed slots
+        """
+        with self._lock:
+            streak = 0 if changed else self._load(slug).get('unchanged_streak', 0) + 1
+            self._update(slug, {'changed': changed, 'unchanged_streak': streak})
+
+
+# Create a global instance of ScrapeScheduler for this process
+scrape_scheduler = ScrapeScheduler()
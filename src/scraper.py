@@ -1,61 +1,70 @@
-import time
-
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
-from bs4 import BeautifulSoup
-
+import uuid
 from datetime import datetime, timedelta
 
-from src.logger import setup_logger
-from src.config import BASE_URL, ENABLE_NOTIFICATIONS
-from src.telegram_bot import TelegramBot
+from celery.exceptions import SoftTimeLimitExceeded
+
+from src.logger import setup_logger, log_context
+from src.config import ENABLE_NOTIFICATIONS, SCRAPER_ENGINE, EXTRACTION_MODE, READY_TIMEOUT
+from src.driver_pool import driver_pool
+from src.http_scraper import HttpCalendarScraper
+from src.calendar_parser import parse_calendar
+from src.js_extraction import extract_slots
 from src.database.operations import available_slots_manager
+from src.venues import get_venue
+from src.metrics import SLOT_CHANGES, SCRAPE_TRANSFER_BYTES, BLOCKED_REQUESTS, timed, record_error
+from src.resource_blocking import reset_network_log, page_stats
 
 logger = setup_logger(__name__)
 
+
+def breaks_driver(error):
+    """
+    Tell whether an error left the browser session unusable.
+
+    Args:
+        error (Exception): Error raised while scraping
+
+    Returns:
+        bool: True for session and connection errors, False for waits that
+              timed out or elements that were missing
+    """
+    from selenium.common.exceptions import (
+        WebDriverException, TimeoutException, NoSuchElementException, StaleElementReferenceException
+    )
+    from urllib3.exceptions import HTTPError
+
+    if isinstance(error, (TimeoutException, NoSuchElementException, StaleElementReferenceException, TimeoutError)):
+        return False
+    return isinstance(error, (WebDriverException, HTTPError, ConnectionError))
+
 class PadelScraper:
-    def __init__(self):
+    def __init__(self, venue=None, pool=None, engine=SCRAPER_ENGINE, extraction_mode=EXTRACTION_MODE):
         try:
-            # Config options for ChromeDriver
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-software-rasterizer')
-            chrome_options.add_argument('--disable-setuid-sandbox')
-            chrome_options.add_argument('--disable-infobars')
-            chrome_options.add_argument('--disable-browser-side-navigation')
-            chrome_options.add_argument('--disable-features=TranslateUI')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-popup-blocking')
-            chrome_options.add_argument('--disable-notifications')
-            chrome_options.add_argument('--disable-default-apps')
-            chrome_options.add_argument('--disable-web-security')
-            chrome_options.add_argument('--disable-features=IsolateOrigins,site-per-process')
-
-            # Initialize the driver with error handling
-            service = Service()
-            self.driver = webdriver.Chrome(
-                service=service,
-                options=chrome_options
-            )
-            logger.info("ChromeDriver initialized successfully.")
-            
-            # Initialize the Telegram notifier
-            self.telegram_notifier = TelegramBot()
+            self.venue = venue or get_venue()
+            self.engine = engine
+            self.extraction_mode = extraction_mode
+
+            # Warm drivers are shared across scrapes in this worker process
+            self.driver_pool = pool or driver_pool
+            self.driver = None
+            # Set when the scrape hit an error that broke the driver
+            self.driver_failed = False
+            self.wait_durations = []
+            self.page_stats = {}
+            self.scrape_id = None
+            self.last_changes = {'added': [], 'removed': []}
             
         except Exception as e:
-            logger.error(f"Error when initializing ChromeDriver: {str(e)}")
+            logger.error(f"Error when initializing PadelScraper: {str(e)}")
             raise
 
+    @property
+    def telegram_notifier(self):
+        """Telegram bot shared by this process, created on first use"""
+        from src.telegram_bot import get_telegram_bot
+
+        return get_telegram_bot()
+
     def get_available_slots(self):
         """
         Extract available slots from the Padel website.
@@ -63,93 +72,158 @@ class PadelScraper:
         Returns:
             list: List of available slots with their information
         """
+        # Selenium is only imported by processes that drive a browser
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from src.page_readiness import PageReadiness
+
         try:
-            # Load the page
-            self.driver.get(BASE_URL)
+            selectors = self.venue.selectors
+            readiness = PageReadiness(
+                self.driver,
+                cell_class=selectors['cell'],
+                date_label_selector=selectors['date_label']
+            )
+            self.wait_durations = readiness.waits
 
-            # Wait for the calendar to load
-            wait = WebDriverWait(self.driver, 10)
-            
-            # Extra time for all elements to load
-            time.sleep(2)
+            # Only count the requests of this scrape on a pooled driver
+            reset_network_log(self.driver)
+
+            with timed('page_load'):
+                # Load the page
+                self.driver.get(self.venue.url)
+
+                # Wait for the calendar to render and its requests to settle
+                wait = WebDriverWait(self.driver, READY_TIMEOUT)
+                readiness.wait_for_calendar()
+                readiness.wait_for_network_idle()
             
             available_slots = []
 
             # Check the next 5 days
             for day in range(5):
-                # Get the HTML after the dynamic content has loaded
-                html_content = self.driver.page_source
-                soup = BeautifulSoup(html_content, 'html.parser')
-
-                # Find all slot cells
-                slots = soup.find_all('span', {'class': 'CalendarioTurnosstyled__Cell-sc-71hh21-2'})
-                
-                for slot in slots:
-                    slot_classes = slot.get('class', [])
-
-                    # Check if the slot is available
-                    if 'available' in slot_classes:
-                        # Get the slot time
-                        slot_time = slot.get('data-cy', '').replace('slot-', '')
-
-                        # Get the court information (the previous div containing the court name and attributes)
-                        court_div = slot.find_previous('div', {'class': 'CalendarioTurnosstyled__CourtCell-sc-71hh21-6'})
-                        if court_div:
-                            court_name = court_div.find('span', {'class': 'CalendarioTurnosstyled__CourtName-sc-71hh21-7'}).text
-                            court_attributes = court_div.find('div', {'class': 'CalendarioTurnosstyled__CourtAttributes-sc-71hh21-8'}).text
-                            
-                            available_slots.append({
-                                'day': (datetime.now() + timedelta(days=day)).strftime("%d/%m/%Y"),
-                                'hour': slot_time,
-                                'court': court_name,
-                                'attributes': court_attributes
-                            })
-                        else:
-                            logger.warning(f"Could not find court information for slot {slot_time}")
+                day_str = (datetime.now() + timedelta(days=day)).strftime("%d/%m/%Y")
+                with timed('parse'):
+                    if self.extraction_mode == 'js':
+                        # Collect the slots inside the page, only compact JSON comes back
+                        available_slots.extend(extract_slots(self.driver, day_str, selectors))
+                    else:
+                        # Get the HTML after the dynamic content has loaded
+                        html_content = self.driver.page_source
+                        available_slots.extend(parse_calendar(html_content, day_str, selectors=selectors))
 
                 # If not the last day, move to the next day
                 if day < 4:
                     try:
-                        # Find and click the next day button
-                        next_day_button = wait.until(
-                            EC.element_to_be_clickable((By.CLASS_NAME, "DatePicker___StyledArrowIcon2-sc-aj5dzg-1"))
-                        )
-                        next_day_button.click()
-                        time.sleep(2)  # Wait for the new day to load
+                        with timed('day_navigation'):
+                            marker = readiness.day_marker()
+
+                            # Find and click the next day button
+                            next_day_button = wait.until(
+                                EC.element_to_be_clickable((By.CLASS_NAME, selectors['next_day']))
+                            )
+                            next_day_button.click()
+
+                            # Wait for the new day to load
+                            if not readiness.wait_for_day_change(marker):
+                                raise TimeoutError("the calendar did not change day")
+                            readiness.wait_for_calendar()
+                    except SoftTimeLimitExceeded:
+                        raise
                     except Exception as e:
+                        if breaks_driver(e):
+                            self.driver_failed = True
                         logger.error(f"Error when moving to the next day: {str(e)}")
                         break
             
+            logger.info(f"Page readiness waits: {readiness.summary()}")
+            self.report_page_stats()
             return available_slots
-            
+
+        except SoftTimeLimitExceeded:
+            # Let the task abort, the browser is killed on the way out
+            raise
         except Exception as e:
+            record_error('scrape')
+            if breaks_driver(e):
+                self.driver_failed = True
             logger.error(f"Error when getting available slots: {str(e)}")
             return []
 
+    def report_page_stats(self):
+        """
+        Log and record the page load timings and bytes transferred by this scrape.
+        """
+        stats = self.page_stats = page_stats(self.driver)
+        SCRAPE_TRANSFER_BYTES.labels(venue=self.venue.slug).observe(stats['bytes'])
+        BLOCKED_REQUESTS.labels(venue=self.venue.slug).inc(stats['blocked'])
+        logger.info(
+            f"Page load: DOMContentLoaded {stats['dom_content_loaded_ms']:.0f} ms, "
+            f"load {stats['load_ms']:.0f} ms, {stats['bytes'] / 1024:.0f} KiB in "
+            f"{stats['requests']} requests, {stats['blocked']} blocked"
+        )
+
     async def check_availability(self):
         """
         Check the availability of slots
         """
-        try:
-            logger.info("Checking slot availability...")
-
-            # Get available slots
-            available_slots = self.get_available_slots()
+        driver_ok = False
+        timed_out = False
+
+        # Tag the records of this scrape, until it returns
+        self.scrape_id = uuid.uuid4().hex[:12]
+        with log_context(scrape_id=self.scrape_id):
+            try:
+                logger.info(f"Checking slot availability for venue {self.venue.slug}...")
+
+                available_slots = None
+                if self.engine == 'http':
+                    # Read the calendar API directly, without a browser
+                    with timed('http_fetch'):
+                        available_slots = HttpCalendarScraper(api_url=self.venue.api_url).get_available_slots()
+                    if available_slots is None:
+                        record_error('http_fetch')
+                        logger.warning("HTTP engine failed, falling back to Selenium")
+
+                if available_slots is None:
+                    # Check out a warm driver, only the venue page is reloaded
+                    self.driver = self.driver_pool.acquire()
+
+                    # Get available slots, a driver broken on the way is not reused
+                    self.driver_failed = False
+                    available_slots = self.get_available_slots()
+                    driver_ok = not self.driver_failed
             
-            if available_slots:
-                logger.info(f"Found {len(available_slots)} available slots:")
-                available_slots_manager.save_slots(available_slots)
-            else:
-                logger.info("No available slots found.")
-
-            return available_slots
-            
-        except Exception as e:
-            logger.error(f"Error when checking availability: {str(e)}")
-            return False
-        finally:
-            # Close the driver after checking availability
-            self.driver.quit()
+                if available_slots:
+                    logger.info(f"Found {len(available_slots)} available slots:")
+                    with timed('save_slots'):
+                        changes = available_slots_manager.save_slots(available_slots, self.venue.slug)
+                    self.last_changes = changes
+                    SLOT_CHANGES.labels(venue=self.venue.slug, change='added').inc(len(changes['added']))
+                    SLOT_CHANGES.labels(venue=self.venue.slug, change='removed').inc(len(changes['removed']))
+                    logger.info(f"{len(changes['added'])} new slots, {len(changes['removed'])} slots taken")
+                else:
+                    logger.info("No available slots found.")
+
+                return available_slots
+
+            except SoftTimeLimitExceeded:
+                timed_out = True
+                raise
+            except Exception as e:
+                record_error('check_availability')
+                logger.error(f"Error when checking availability: {str(e)}")
+                return False
+            finally:
+                # Hand the driver back to the pool, dropping it if the scrape broke it
+                # and killing it if the scrape ran out of time
+                if self.driver is not None:
+                    if driver_ok:
+                        self.driver_pool.release(self.driver)
+                    else:
+                        self.driver_pool.discard(self.driver, kill=timed_out)
+                    self.driver = None
 
     async def notify_availability(self, available_slots):
         """
@@ -0,0 +1,288 @@
+import fcntl
+import gzip
+import os
+import statistics
+import time
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta
+
+from src.logger import setup_logger
+from src.config import HISTORY_DIR, HISTORY_RETENTION_DAYS
+from src.database.formats import DAY_FORMAT, HOUR_FORMAT
+
+logger = setup_logger(__name__)
+
+# Segments being appended to, one gzip member per scrape
+LIVE_SUFFIX = '.log.gz'
+
+# Closed segments rewritten as a single gzip member
+COMPACT_SUFFIX = '.gz'
+
+OPENED = '+'
+CLOSED = '-'
+
+SlotEvent = namedtuple('SlotEvent', 'timestamp venue day hour court kind')
+
+
+def _month(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m')
+
+
+def _same_file(f, path):
+    """Tell whether an open file is still the one at path"""
+    try:
+        return os.fstat(f.fileno()).st_ino == os.stat(path).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def _encode(previous_ts, timestamp, changes, keys):
+    """
+    Encode one scrape as text lines.
+
+    The scrape time is stored as a delta from the previous scrape of the
+    segment and slots are interned: a key is written once per segment as
+    `K<id> day|hour|court` and later events only reference its id.
+    """
+    lines = [f"T{timestamp - previous_ts}"]
+    for kind, slots in ((OPENED, changes.get('added', [])), (CLOSED, changes.get('removed', []))):
+        for slot in slots:
+            key = f"{slot['day']}|{slot['hour']}|{slot['court']}"
+            key_id = keys.get(key)
+            if key_id is None:
+                key_id = keys[key] = len(keys)
+                lines.append(f"K{key_id} {key}")
+            lines.append(f"{kind}{key_id}")
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def _decode(lines):
+    """
+    Decode segment lines.
+
+    Yields:
+        tuple: (timestamp, kind, (day, hour, court)) per event
+    """
+    timestamp = 0
+    keys = []
+    for line in lines:
+        tag, value = line[0], line[1:].rstrip('\n')
+        if tag == 'T':
+            timestamp += int(value)
+        elif tag == 'K':
+            _, key = value.split(' ', 1)
+            keys.append(tuple(key.split('|', 2)))
+        elif tag in (OPENED, CLOSED):
+            yield timestamp, tag, keys[int(value)]
+
+
+class SlotHistory:
+    """
+    Append-only history of slot open and close events.
+
+    Every venue has one segment per month. A scrape appends its changes as
+    a small gzip member to the live segment; closed months are compacted
+    into a single member and dropped after the retention period.
+    """
+
+    def __init__(self, directory=HISTORY_DIR, retention_days=HISTORY_RETENTION_DAYS):
+        self.directory = directory
+        self.retention_days = retention_days
+        # Live segment path -> (size, last timestamp, interned keys)
+        self._writers = {}
+
+    def _segment_path(self, venue, month, suffix=LIVE_SUFFIX):
+        return os.path.join(self.directory, venue, month + suffix)
+
+    def _segments(self, venue=None):
+        """
+        Returns:
+            list: (venue, month, path) of every segment, oldest first
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        venue_names = [venue] if venue else sorted(os.listdir(self.directory))
+        segments = []
+        for name in venue_names:
+            venue_dir = os.path.join(self.directory, name)
+            if not os.path.isdir(venue_dir):
+                continue
+            for filename in os.listdir(venue_dir):
+                for suffix in (LIVE_SUFFIX, COMPACT_SUFFIX):
+                    if filename.endswith(suffix):
+                        month = filename[:-len(suffix)]
+                        segments.append((name, month, os.path.join(venue_dir, filename)))
+                        break
+        return sorted(segments, key=lambda segment: (segment[1], segment[0]))
+
+    @staticmethod
+    def _read_state(path):
+        timestamp, keys = 0, {}
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line[0] == 'T':
+                    timestamp += int(line[1:])
+                elif line[0] == 'K':
+                    key_id, key = line[1:].rstrip('\n').split(' ', 1)
+                    keys[key] = int(key_id)
+        return timestamp, keys
+
+    def append(self, venue, changes, timestamp=None):
+        """
+        Append the changes of one scrape.
+
+        Args:
+            venue (str): Scraped venue
+            changes (dict): {'added', 'removed'} lists of {'day', 'hour', 'court'} dicts
+            timestamp (int, optional): Scrape time in epoch seconds
+
+        Returns:
+            int: Bytes written
+        """
+        if not changes.get('added') and not changes.get('removed'):
+            return 0
+
+        timestamp = int(timestamp if timestamp is not None else time.time())
+        path = self._segment_path(venue, _month(timestamp))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        while True:
+            with open(path, 'ab') as f:
+                # Workers of the same venue may append concurrently
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    # compact may have removed the segment while this append
+                    # waited for the lock, write to a fresh file then
+                    if not _same_file(f, path):
+                        continue
+
+                    size = os.fstat(f.fileno()).st_size
+                    state = self._writers.get(path)
+                    if state is None or state[0] != size:
+                        previous_ts, keys = self._read_state(path) if size else (0, {})
+                    else:
+                        _, previous_ts, keys = state
+
+                    member = gzip.compress(_encode(previous_ts, timestamp, changes, keys))
+                    f.write(member)
+                    f.flush()
+                    self._writers[path] = (size + len(member), timestamp, keys)
+                    return len(member)
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def events(self, venue=None, since=None, until=None):
+        """
+        Iterate over the recorded events in time order per segment.
+
+        Args:
+            venue (str, optional): Only events of this venue
+            since (datetime, optional): Only events at or after this time
+            until (datetime, optional): Only events before this time
+
+        Yields:
+            SlotEvent: Events with a datetime timestamp
+        """
+        since_ts = since.timestamp() if since else None
+        until_ts = until.timestamp() if until else None
+        for segment_venue, _, path in self._segments(venue):
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for timestamp, kind, (day, hour, court) in _decode(f):
+                    if since_ts is not None and timestamp < since_ts:
+                        continue
+                    if until_ts is not None and timestamp >= until_ts:
+                        continue
+                    yield SlotEvent(datetime.fromtimestamp(timestamp), segment_venue, day, hour, court, kind)
+
+    def free_up_profile(self, hour, court=None, venue=None, since=None):
+        """
+        Describe when slots at an hour usually free up, e.g. 18:00 on a court.
+
+        Args:
+            hour (str): Slot hour in format HH:MM
+            court (str, optional): Only this court
+            venue (str, optional): Only this venue
+            since (datetime, optional): Only events at or after this time
+
+        Returns:
+            dict: Number of openings, median lead time in hours before the
+                slot, and openings by lead hours, by weekday and by hour of day
+        """
+        leads = []
+        by_weekday = Counter()
+        by_hour = Counter()
+        slot_hour = datetime.strptime(hour, HOUR_FORMAT).time()
+
+        for event in self.events(venue, since=since):
+            if event.kind != OPENED or event.hour != hour or (court and event.court != court):
+                continue
+            slot_at = datetime.combine(datetime.strptime(event.day, DAY_FORMAT).date(), slot_hour)
+            leads.append((slot_at - event.timestamp).total_seconds() / 3600)
+            by_weekday[event.timestamp.strftime('%A')] += 1
+            by_hour[event.timestamp.hour] += 1
+
+        return {
+            'openings': len(leads),
+            'median_lead_hours': statistics.median(leads) if leads else None,
+            'by_lead_hours': Counter(int(lead) for lead in leads),
+            'by_weekday': by_weekday,
+            'by_hour': by_hour,
+        }
+
+    def compact(self, now=None):
+        """
+        Rewrite every closed live segment as a single gzip member.
+
+        Returns:
+            int: Bytes saved
+        """
+        current = (now or datetime.now()).strftime('%Y-%m')
+        saved = 0
+        for venue, month, path in self._segments():
+            if month >= current or not path.endswith(LIVE_SUFFIX):
+                continue
+
+            target = self._segment_path(venue, month, COMPACT_SUFFIX)
+            if os.path.exists(target):
+                # Keys and deltas restart per file, late appends stay in their own segment
+                continue
+
+            with open(path, 'rb') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                data = gzip.decompress(f.read())
+                with open(target + '.tmp', 'wb') as out:
+                    out.write(gzip.compress(data, compresslevel=9))
+                os.replace(target + '.tmp', target)
+                saved += os.path.getsize(path) - os.path.getsize(target)
+                os.remove(path)
+            self._writers.pop(path, None)
+            logger.info(f"Compacted history segment {venue}/{month}")
+        return saved
+
+    def apply_retention(self, now=None):
+        """
+        Delete the segments of months that ended before the retention period.
+
+        Returns:
+            int: Number of deleted segments
+        """
+        cutoff = ((now or datetime.now()) - timedelta(days=self.retention_days)).strftime('%Y-%m')
+        deleted = 0
+        for venue, month, path in self._segments():
+            if month < cutoff:
+                os.remove(path)
+                self._writers.pop(path, None)
+                deleted += 1
+                logger.info(f"Deleted history segment {venue}/{month} past retention")
+        return deleted
+
+    def size(self):
+        """
+        Returns:
+            int: Bytes used by all segments
+        """
+        return sum(os.path.getsize(path) for _, _, path in self._segments())
+
+
+# Create a global instance of SlotHistory for this process
+slot_history = SlotHistory()
@@ -0,0 +1,178 @@
+from bisect import bisect_left, bisect_right
+from datetime import time
+from functools import lru_cache
+
+from src.database.formats import parse_day
+
+# Subscriptions match slots starting up to 3 hours after the requested hour
+WINDOW_MINUTES = 180
+
+
+def to_minutes(hour):
+    """
+    Convert an hour to minutes since midnight.
+
+    Args:
+        hour (str | time): Hour in format HH:MM
+
+    Returns:
+        int: Minutes since midnight
+    """
+    if isinstance(hour, time):
+        return hour.hour * 60 + hour.minute
+    hours, minutes = hour.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+@lru_cache(maxsize=64)
+def _day_key(day):
+    # Slots carry DD/MM/YYYY strings while subscriptions carry dates
+    return parse_day(day)
+
+
+class SubscriptionIndex:
+    """
+    Subscription time windows indexed by day as integer minute ranges.
+
+    Windows of a day are kept sorted by start, so the subscriptions matching
+    a slot are found with two bisections over the starts instead of a scan.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._days = {}
+        self._max_span = 0
+        self.size = 0
+
+    def add(self, day, hour, payload, window=WINDOW_MINUTES):
+        """
+        Add a subscription window to the index.
+
+        Args:
+            day (str | date): Day in format DD/MM/YYYY
+            hour (str | time): Start hour in format HH:MM
+            payload: Value returned when the window matches, usually the subscription
+            window (int): Window length in minutes
+        """
+        start = to_minutes(hour)
+        self._pending.setdefault(_day_key(day), []).append((start, start + window, payload))
+        self._max_span = max(self._max_span, window)
+        self.size += 1
+
+    @classmethod
+    def from_subscriptions(cls, subscriptions):
+        """
+        Build an index from Subscription objects.
+
+        Returns:
+            SubscriptionIndex: Index whose payloads are the subscriptions
+        """
+        index = cls()
+        for subscription in subscriptions:
+            index.add(subscription.day, subscription.hour, subscription)
+        return index
+
+    def _windows(self, day):
+        # Sort lazily, once per day, after the adds
+        pending = self._pending.pop(day, None)
+        if pending:
+            windows = self._days.get(day, ([], [], []))
+            merged = sorted(
+                list(zip(*windows)) + pending,
+                key=lambda window: window[0]
+            )
+            self._days[day] = tuple(list(column) for column in zip(*merged))
+        return self._days.get(day)
+
+    def match(self, day, hour):
+        """
+        Find the payloads whose window contains a slot.
+
+        Args:
+            day (str | date): Day in format DD/MM/YYYY
+            hour (str | time): Slot hour in format HH:MM
+
+        Returns:
+            list: Matching payloads
+        """
+        return self._match_minute(_day_key(day), to_minutes(hour))
+
+    def _match_minute(self, key, minute):
+        windows = self._windows(key)
+        if not windows:
+            return []
+
+        starts, ends, payloads = windows
+
+        # Only windows starting in [minute - max span, minute] can contain the slot
+        low = bisect_left(starts, minute - self._max_span)
+        high = bisect_right(starts, minute)
+        return [payloads[i] for i in range(low, high) if ends[i] >= minute]
+
+    def match_slots(self, slots):
+        """
+        Match a batch of slots against every indexed window.
+
+        Args:
+            slots (list): List of {'day', 'hour', ...} dicts
+
+        Returns:
+            dict: Payload -> list of matching slots, in slot order
+        """
+        matches = {}
+        for slot in slots:
+            for payload in self.match(slot['day'], slot['hour']):
+                matches.setdefault(payload, []).append(slot)
+        return matches
+
+
+class RuleIndex(SubscriptionIndex):
+    """
+    Recurring subscription rules indexed by weekday instead of by day.
+
+    A rule is added once per weekday of its mask, however many dates its
+    range covers, and the date range is only checked on the few windows
+    that contain a slot's hour.
+    """
+
+    def add_rule(self, rule):
+        """
+        Add a SubscriptionRule to the index.
+
+        Args:
+            rule (SubscriptionRule): Rule, also returned as the payload
+        """
+        start = to_minutes(rule.start_hour)
+        end = to_minutes(rule.end_hour)
+        for weekday in range(7):
+            if rule.weekdays & (1 << weekday):
+                self._pending.setdefault(weekday, []).append((start, end, rule))
+        self._max_span = max(self._max_span, end - start)
+        self.size += 1
+
+    @classmethod
+    def from_rules(cls, rules):
+        """
+        Build an index from SubscriptionRule objects.
+
+        Returns:
+            RuleIndex: Index whose payloads are the rules
+        """
+        index = cls()
+        for rule in rules:
+            index.add_rule(rule)
+        return index
+
+    def match(self, day, hour):
+        """
+        Find the rules covering a slot.
+
+        Args:
+            day (str | date): Day in format DD/MM/YYYY
+            hour (str | time): Slot hour in format HH:MM
+
+        Returns:
+            list: Matching rules
+        """
+        day = _day_key(day)
+        return [rule for rule in self._match_minute(day.weekday(), to_minutes(hour)) if rule.covers(day)]
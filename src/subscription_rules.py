@@ -0,0 +1,116 @@
+import unicodedata
+from datetime import date, time
+
+from src.database.formats import parse_day, parse_hour, format_hour
+from src.subscription_index import WINDOW_MINUTES, to_minutes
+
+# Weekday abbreviations accepted by /repeat, Monday first like date.weekday()
+WEEKDAY_NAMES = ['lun', 'mar', 'mie', 'jue', 'vie', 'sab', 'dom']
+ALL_WEEKDAYS = (1 << 7) - 1
+
+
+def _weekday(name):
+    # "Miércoles" and "mie" both map to Wednesday
+    name = unicodedata.normalize('NFKD', name.strip().lower())
+    name = ''.join(char for char in name if not unicodedata.combining(char))[:3]
+    if name not in WEEKDAY_NAMES:
+        raise ValueError(f"Unknown weekday: {name}")
+    return WEEKDAY_NAMES.index(name)
+
+
+def parse_weekdays(text):
+    """
+    Parse a list of weekdays and weekday ranges into a mask.
+
+    Args:
+        text (str): E.g. "mar,jue", "lun-vie" or "todos"
+
+    Returns:
+        int: Weekday mask, bit 0 is Monday
+
+    Raises:
+        ValueError: If a weekday is unknown
+    """
+    if text.strip().lower() == 'todos':
+        return ALL_WEEKDAYS
+
+    mask = 0
+    for part in text.split(','):
+        if '-' in part:
+            first, last = (_weekday(name) for name in part.split('-', 1))
+            # Ranges wrap around the week, e.g. "vie-lun"
+            weekday = first
+            while True:
+                mask |= 1 << weekday
+                if weekday == last:
+                    break
+                weekday = (weekday + 1) % 7
+        else:
+            mask |= 1 << _weekday(part)
+    return mask
+
+
+def parse_hour_window(text):
+    """
+    Parse an hour or an hour range.
+
+    Args:
+        text (str): "HH:MM" for the usual 3 hour window, or "HH:MM-HH:MM"
+
+    Returns:
+        tuple: (start time, end time)
+
+    Raises:
+        ValueError: If an hour is invalid or the range is reversed
+    """
+    if '-' in text:
+        start, end = (parse_hour(hour) for hour in text.split('-', 1))
+    else:
+        start = parse_hour(text)
+        end_minute = min(to_minutes(start) + WINDOW_MINUTES, 24 * 60 - 1)
+        end = time(end_minute // 60, end_minute % 60)
+    if end < start:
+        raise ValueError("The end hour must not be before the start hour")
+    return start, end
+
+
+def parse_date_range(text, today=None):
+    """
+    Parse a DD/MM-DD/MM range in the current year. An end before the start
+    falls in the next year, and a range already over means next year's.
+
+    Args:
+        text (str): Date range
+        today (date, optional): Reference day, defaults to the current date
+
+    Returns:
+        tuple: (start date, end date)
+
+    Raises:
+        ValueError: If a date is invalid
+    """
+    today = today or date.today()
+    start, end = (parse_day(f"{day}/{today.year}") for day in text.split('-', 1))
+    if end < start:
+        end = end.replace(year=end.year + 1)
+    if end < today:
+        start, end = start.replace(year=start.year + 1), end.replace(year=end.year + 1)
+    return start, end
+
+
+def describe_weekdays(mask):
+    if mask == ALL_WEEKDAYS:
+        return 'todos los días'
+    return ', '.join(name for weekday, name in enumerate(WEEKDAY_NAMES) if mask & (1 << weekday))
+
+
+def describe_rule(rule):
+    """
+    Returns:
+        str: One line summary of a SubscriptionRule for the bot replies
+    """
+    dates = f"desde el {rule.start_date.strftime('%d/%m')}"
+    if rule.end_date is not None:
+        dates += f" hasta el {rule.end_date.strftime('%d/%m')}"
+    return (f"#{rule.id}: {describe_weekdays(rule.weekdays)}, "
+            f"{format_hour(rule.start_hour)}-{format_hour(rule.end_hour)}, {dates}")
@@ -1,5 +1,18 @@
+from celery.signals import worker_process_shutdown
+
+from ..logger import logging_pipeline
 from .celery_config import celery_app
 from .check_availability import check_availability
-from .check_subscription import check_subscriptions
+from .check_subscription import check_subscriptions, notify_new_slots
+from .schedule_scrapes import schedule_scrapes
+from .maintain_history import maintain_history
+
+__all__ = ['celery_app', 'check_availability', 'check_subscriptions', 'notify_new_slots', 'schedule_scrapes', 'maintain_history']
 
-__all__ = ['celery_app', 'check_availability', 'check_subscriptions'] 
\ No newline at end of file
+@worker_process_shutdown.connect
+def flush_worker_logs(**kwargs):
+    """
+    Write the queued log records before the worker child exits. Connected
+    after the task modules, so the records of their shutdown handlers are included
+    """
+    logging_pipeline.flush()
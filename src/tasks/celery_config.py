@@ -1,5 +1,14 @@
+import os
+
 from celery import Celery
-from ..config import CELERY_BROKER_URL, CELERY_RESULT_BACKEND, CHECK_INTERVAL
+from celery.signals import worker_init, worker_process_shutdown, task_prerun, task_postrun
+from ..config import (
+    CELERY_BROKER_URL, CELERY_RESULT_BACKEND, SUBSCRIPTION_SWEEP_INTERVAL,
+    ADAPTIVE_SCHEDULING, SCHEDULER_TICK, WORKER_METRICS_PORT
+)
+from ..metrics import start_metrics_server, mark_process_dead
+from ..logger import task_id_var
+from ..venues import venues
 
 # Celery configuration
 celery_app = Celery(
@@ -14,16 +23,63 @@ celery_app.conf.update(
     worker_task_log_format='[%(asctime)s: %(levelname)s/%(processName)s][%(task_name)s(%(task_id)s)] %(message)s',
     worker_redirect_stdouts=False,
     worker_redirect_stdouts_level='INFO',
+    # Scrapes go to one queue per venue, everything else to the default queue
+    task_default_queue='celery',
 )
 
 # Celery beat schedule configuration
-celery_app.conf.beat_schedule = {
-    'check-availability': {
-        'task': 'src.tasks.check_availability.check_availability',
-        'schedule': CHECK_INTERVAL * 60.0,  # Convert minutes to seconds
-    },
+if ADAPTIVE_SCHEDULING:
+    # A short tick decides which venues are due, see src/scrape_scheduler.py
+    celery_app.conf.beat_schedule = {
+        'schedule-scrapes': {
+            'task': 'src.tasks.schedule_scrapes.schedule_scrapes',
+            'schedule': float(SCHEDULER_TICK),
+        },
+    }
+else:
+    celery_app.conf.beat_schedule = {
+        f'check-availability-{venue.slug}': {
+            'task': 'src.tasks.check_availability.check_availability',
+            'schedule': venue.interval * 60.0,  # Convert minutes to seconds
+            'args': [venue.slug],
+            # A run still queued when the next one is due is dropped, not piled up
+            'options': {'queue': venue.queue, 'expires': venue.interval * 60.0},
+        }
+        for venue in venues.values()
+    }
+celery_app.conf.beat_schedule.update({
     'check-subscriptions': {
         'task': 'src.tasks.check_subscription.check_subscriptions',
-        'schedule': 200.0,  # 200 seconds
+        # New slots are matched on scrape, this sweep is only a safety net
+        'schedule': SUBSCRIPTION_SWEEP_INTERVAL * 60.0,  # Convert minutes to seconds
+    },
+    'maintain-history': {
+        'task': 'src.tasks.maintain_history.maintain_history',
+        'schedule': 24 * 60 * 60.0,  # Once a day
     },
-} 
+})
+
+@worker_init.connect
+def start_worker_metrics(**kwargs):
+    """
+    Expose the metrics of every worker child from the main worker process
+    """
+    start_metrics_server(WORKER_METRICS_PORT)
+
+@worker_process_shutdown.connect
+def drop_worker_metrics(**kwargs):
+    """
+    Discard the live values of an exiting worker child
+    """
+    mark_process_dead(os.getpid())
+
+@task_prerun.connect
+def bind_task_log_context(task_id=None, **kwargs):
+    """
+    Tag the records logged while a task runs with its ID
+    """
+    task_id_var.set(task_id)
+
+@task_postrun.connect
+def clear_task_log_context(**kwargs):
+    task_id_var.set(None)
@@ -1,23 +1,83 @@
 import asyncio
+
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.signals import worker_process_shutdown
+
 from ..scraper import PadelScraper
+from ..driver_pool import driver_pool
+from ..notification_dedup import notification_dedup
+from ..venues import get_venue
+from ..scrape_scheduler import scrape_scheduler
+from ..scrape_lock import scrape_lock
+from ..slot_history import slot_history
+from ..config import HISTORY_ENABLED, SCRAPE_SOFT_TIME_LIMIT, SCRAPE_TIME_LIMIT
+from ..metrics import SCRAPES_SKIPPED, SCRAPES_TIMED_OUT
+from ..database.models.available_slots_model import DEFAULT_VENUE
 from ..logger import setup_logger
 from .celery_config import celery_app
+from .check_subscription import notify_new_slots
 
 logger = setup_logger(__name__)
 
-@celery_app.task
-def check_availability():
+@worker_process_shutdown.connect
+def shutdown_driver_pool(**kwargs):
     """
-    Celery task to check for availability of slots
+    Quit the warm ChromeDrivers owned by this worker process
+    """
+    driver_pool.shutdown()
+
+@celery_app.task(soft_time_limit=SCRAPE_SOFT_TIME_LIMIT, time_limit=SCRAPE_TIME_LIMIT)
+def check_availability(venue=DEFAULT_VENUE):
     """
-    try:
-        logger.info("Starting check availability task...")
-        scraper = PadelScraper()
-
-        # Run the scraper and wait for the result
-        available_slots = asyncio.run(scraper.check_availability())
-        logger.info("Check availability task completed successfully")
-        return {"status": "success", "slots_found": len(available_slots)}
-    except Exception as e:
-        logger.error(f"Error in check availability task: {str(e)}")
-        raise 
\ No newline at end of file
+    Celery task to check for availability of slots.
+    Scheduled once per venue on the venue's own queue, a run is skipped
+    while another run of the same venue is in flight.
+
+    Args:
+        venue (str): Slug of the venue to scrape
+    """
+    with scrape_lock.hold(venue) as acquired:
+        if not acquired:
+            # The run in flight will save fresher slots than this one
+            SCRAPES_SKIPPED.labels(venue=venue).inc()
+            logger.info(f"Scrape of venue {venue} already in progress, skipping this run")
+            return {"status": "skipped", "venue": venue}
+
+        try:
+            logger.info(f"Starting check availability task for venue {venue}...")
+            scraper = PadelScraper(venue=get_venue(venue))
+
+            # Run the scraper and wait for the result
+            available_slots = asyncio.run(scraper.check_availability())
+
+            # Keep the open/close events, the slots table only holds the latest snapshot
+            if HISTORY_ENABLED:
+                try:
+                    slot_history.append(venue, scraper.last_changes)
+                except Exception as e:
+                    logger.error(f"Error appending slot history: {str(e)}")
+
+            # Taken slots are notified again if they reopen later
+            try:
+                notification_dedup.forget(scraper.last_changes['removed'])
+            except Exception as e:
+                logger.error(f"Error forgetting notified slots: {str(e)}")
+
+            # Feed the outcome to the adaptive scheduler
+            added = scraper.last_changes['added']
+            scrape_scheduler.record_result(venue, bool(added or scraper.last_changes['removed']))
+
+            # Match the new slots against subscriptions right away
+            if added:
+                notify_new_slots.delay(added)
+
+            logger.info("Check availability task completed successfully")
+            return {"status": "success", "venue": venue, "slots_found": len(available_slots)}
+        except SoftTimeLimitExceeded:
+            # The scraper already killed its browser, the lock is released on the way out
+            SCRAPES_TIMED_OUT.labels(venue=venue).inc()
+            logger.error(f"Check availability task for venue {venue} exceeded {SCRAPE_SOFT_TIME_LIMIT}s, aborted")
+            return {"status": "timed_out", "venue": venue}
+        except Exception as e:
+            logger.error(f"Error in check availability task: {str(e)}")
+            raise
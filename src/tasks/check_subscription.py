@@ -1,63 +1,159 @@
-from datetime import datetime
-
 from celery import shared_task
 
 from src.database.operations.subscription_manager import subscription_manager
+from src.database.operations.subscription_rule_manager import subscription_rule_manager
 from src.database.operations.available_slots_manager import available_slots_manager
+from src.availability_cache import availability_cache
 from src.logger import setup_logger
-from src.telegram_bot import TelegramBot
+from src.subscription_index import SubscriptionIndex, RuleIndex
+from src.notification_dispatcher import notification_dispatcher
+from src.notification_digest import NotificationDigest
+from src.database.models.available_slots_model import DEFAULT_VENUE
+from src.metrics import timed
 
 logger = setup_logger(__name__)
 
 
+def to_notification_slots(slots):
+    """
+    Convert scraped slots to the format of the notifications, sorted by hour.
+
+    Args:
+        slots (list): List of {'day', 'hour', 'court', 'venue'} dicts
+
+    Returns:
+        list: List of {'fecha', 'hora', 'cancha', 'sede'} dicts
+    """
+    return sorted(
+        (
+            {
+                'fecha': slot['day'],
+                'hora': slot['hour'],
+                'cancha': slot['court'],
+                'sede': slot.get('venue', DEFAULT_VENUE),
+            }
+            for slot in slots
+        ),
+        key=lambda x: x['hora']
+    )
+
+
+@shared_task
+def notify_new_slots(slots):
+    """
+    Task triggered after a scrape persisted new slots.
+    Matches only those slots against the subscriptions of their days.
+
+    Args:
+        slots (list): Newly added {'day', 'hour', 'court', 'attributes'} dicts
+    """
+    if not slots:
+        return
+
+    logger.info(f"Matching {len(slots)} new slots against subscriptions")
+
+    with timed('subscription_match'):
+        days = {slot['day'] for slot in slots}
+        subscriptions = subscription_manager.get_subscriptions_by_days(days)
+
+        # Index the subscription windows once, then bisect per slot
+        index = SubscriptionIndex.from_subscriptions(subscriptions)
+        matches = index.match_slots(slots)
+
+        # Recurring rules are indexed by weekday, never expanded into dates
+        rule_index = RuleIndex.from_rules(subscription_rule_manager.get_active_rules(days))
+        matches.update(rule_index.match_slots(slots))
+
+    if not matches:
+        logger.debug("No subscription matches the new slots")
+        return
+
+    try:
+        # Imported here so python-telegram-bot is not loaded at worker boot
+        from src.telegram_bot import get_telegram_bot
+        telegram_bot = get_telegram_bot()
+    except Exception as e:
+        logger.error(f"Failed to initialize Telegram bot: {str(e)}")
+        return
+
+    digest = NotificationDigest()
+    for subscription, matched_slots in matches.items():
+        digest.add(subscription, to_notification_slots(matched_slots))
+
+    # One message per chat, however many of its subscriptions matched
+    digest.send(telegram_bot)
+
+    # Wait for the queued notifications to go out before the task ends
+    notification_dispatcher.flush()
+
+
 @shared_task
 def check_subscriptions():
     """
     Task that checks subscriptions and notifies users if slots are available.
-    Deletes past subscriptions and notifies about future ones if availability exists.
+    Deletes past subscriptions and expired rules, and notifies about the
+    remaining ones if availability exists.
+    New slots are matched as soon as they are scraped by notify_new_slots,
+    this periodic sweep is kept as a low-frequency safety net.
     """
     logger.info("Starting subscription verification")
     
     try:
-        # Create a new instance of the Telegram bot for this task
-        telegram_bot = TelegramBot()
+        # Reuse the Telegram bot of this worker process
+        from src.telegram_bot import get_telegram_bot
+        telegram_bot = get_telegram_bot()
         logger.info("Telegram bot initialized for subscription check")
     except Exception as e:
         logger.error(f"Failed to initialize Telegram bot: {str(e)}")
         return
 
-    current_date = datetime.now().strftime('%d/%m/%Y')
+    # Delete past subscriptions and expired rules in a single statement each
+    deleted = subscription_manager.delete_past_subscriptions()
+    if deleted:
+        logger.info(f"Deleted {deleted} past subscriptions")
+    expired = subscription_rule_manager.delete_expired_rules()
+    if expired:
+        logger.info(f"Deleted {expired} expired subscription rules")
     
-    # Get all subscriptions
+    # Get the remaining (current and future) subscriptions
     subscriptions = subscription_manager.get_subscriptions()
+    digest = NotificationDigest()
     
     for subscription in subscriptions:
-        logger.debug(f"Processing subscription: day={subscription.day}, hour={subscription.hour}, chat_id={subscription.chat_id}")
+        # Lazy arguments, the message is never built when DEBUG is filtered out
+        logger.debug("Processing subscription: day=%s, hour=%s, chat_id=%s",
+                     subscription.day, subscription.hour, subscription.chat_id)
         
-        # Compare dates
-        sub_date = datetime.strptime(subscription.day, '%d/%m/%Y')
-        current_date_obj = datetime.strptime(current_date, '%d/%m/%Y')
-        
-        if sub_date < current_date_obj:
-            # Delete past subscriptions
-            logger.info(f"Deleting past subscription: {subscription.day} {subscription.hour}")
-            subscription_manager.session.delete(subscription)
-            subscription_manager.session.commit()
-        else:
-            # Check availability for future subscriptions
+        # Check availability for future subscriptions
+        with timed('subscription_match'):
             available_slots = available_slots_manager.get_available_slots_by_day_and_hour(
                 subscription.day,
                 subscription.hour
             )
+        
+        if available_slots:
+            # Collected per chat, sent as a single digest after the sweep
+            digest.add(subscription, available_slots)
             
-            if available_slots:
-                # Notify user using the bot instance
-                logger.info(f"Notifying availability to chat_id {subscription.chat_id} for {subscription.day} {subscription.hour}")
-                # Use asyncio to run the async notification
-                import asyncio
-                slots_to_notify = available_slots[:3]
-                asyncio.run(telegram_bot.notify_available_slots(slots_to_notify, subscription.chat_id))
-                
-            else:
-                logger.debug(f"No slots available for {subscription.day} {subscription.hour}")
-    
\ No newline at end of file
+        else:
+            logger.debug("No slots available for %s %s", subscription.day, subscription.hour)
+
+    # Match the stored slots against the recurring rules in one pass
+    with timed('subscription_match'):
+        slots = available_slots_manager.get_slots_since()
+        days = {slot['day'] for slot in slots}
+        rule_index = RuleIndex.from_rules(subscription_rule_manager.get_active_rules(days))
+        rule_matches = rule_index.match_slots(slots)
+    logger.debug(f"{len(rule_matches)} of {rule_index.size} subscription rules match {len(slots)} slots")
+
+    for rule, matched_slots in rule_matches.items():
+        digest.add(rule, to_notification_slots(matched_slots))
+
+    digest.send(telegram_bot)
+
+    # Wait for the queued notifications to go out before the task ends
+    notification_dispatcher.flush()
+
+    stats = availability_cache.stats()
+    logger.info(f"Availability cache: {stats['hits']} hits, {stats['misses']} misses, "
+                f"hit rate {stats['hit_rate']:.0%}")
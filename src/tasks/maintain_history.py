@@ -0,0 +1,20 @@
+from ..slot_history import slot_history
+from ..logger import setup_logger
+from .celery_config import celery_app
+
+logger = setup_logger(__name__)
+
+@celery_app.task
+def maintain_history():
+    """
+    Celery task that compacts closed history segments and applies the retention
+    """
+    try:
+        saved = slot_history.compact()
+        deleted = slot_history.apply_retention()
+        logger.info(f"History maintenance: {saved} bytes saved by compaction, "
+                    f"{deleted} segments past retention deleted, {slot_history.size()} bytes in use")
+        return {"status": "success", "saved_bytes": saved, "deleted_segments": deleted}
+    except Exception as e:
+        logger.error(f"Error in maintain history task: {str(e)}")
+        raise
@@ -0,0 +1,40 @@
+from datetime import date, timedelta
+
+from ..scrape_scheduler import scrape_scheduler
+from ..venues import venues
+from ..config import SCRAPE_DEMAND_DAYS
+from ..database.operations.subscription_manager import subscription_manager
+from ..database.operations.subscription_rule_manager import subscription_rule_manager
+from ..logger import setup_logger
+from .celery_config import celery_app
+from .check_availability import check_availability
+
+logger = setup_logger(__name__)
+
+def count_demand(days=SCRAPE_DEMAND_DAYS):
+    """
+    Count the subscriptions and the recurring rules for today and the following days
+    """
+    today = date.today()
+    upcoming = [today + timedelta(days=offset) for offset in range(days)]
+    rules = subscription_rule_manager.get_active_rules(upcoming)
+    return len(subscription_manager.get_subscriptions_by_days(upcoming)) + \
+        sum(1 for rule in rules if any(rule.covers(day) for day in upcoming))
+
+@celery_app.task
+def schedule_scrapes():
+    """
+    Beat tick that dispatches the scrapes of the venues whose adaptive interval elapsed
+    """
+    try:
+        demand = count_demand()
+        scheduled = []
+        for venue, interval, reason in scrape_scheduler.due(venues.values(), demand):
+            # A run still queued when the next one is due is dropped, not piled up
+            check_availability.apply_async(args=[venue.slug], queue=venue.queue, expires=interval * 60.0)
+            logger.info(f"Scheduled scrape of {venue.slug}, next in {interval:g} min ({reason})")
+            scheduled.append({"venue": venue.slug, "interval": interval, "reason": reason})
+        return {"status": "success", "scheduled": scheduled}
+    except Exception as e:
+        logger.error(f"Error in schedule scrapes task: {str(e)}")
+        raise
@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import date, datetime
+from functools import cached_property, lru_cache
 
 from typing import Set
 
@@ -7,24 +8,51 @@ from telegram.ext import Application, CommandHandler, ContextTypes
 from telegram.error import TelegramError
 
 from src.logger import setup_logger
-from src.config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+from src.config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, BOT_CONCURRENT_UPDATES
 from src.database.operations import available_slots_manager, subscription_manager
+from src.database.operations.subscription_rule_manager import subscription_rule_manager
+from src.subscription_rules import parse_weekdays, parse_hour_window, parse_date_range, describe_rule
+from src.database.models.available_slots_model import DEFAULT_VENUE
+from src.venues import venues
+from src.metrics import timed
+from src.db_executor import db_executor
 
 logger = setup_logger(__name__)
 
+# Telegram rejects messages longer than this many characters, counted after
+# the HTML tags are stripped, so measuring the raw HTML stays on the safe side
+MESSAGE_LIMIT = 4096
+
+MESSAGE_HEADER = "🎾 <b>¡Turnos disponibles encontrados!</b>\n\n"
+
 class TelegramBot:
     def __init__(self):
         # Initialize the bot
         self.bot = Bot(token=TELEGRAM_BOT_TOKEN)
         self.chat_ids: Set[int] = {TELEGRAM_CHAT_ID}
-        self.application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
-        
+
+    @cached_property
+    def application(self):
+        """
+        Polling application with the command handlers, only the bot process
+        needs it so it is built on first access.
+        """
+        # Updates of different chats are handled concurrently
+        application = Application.builder() \
+            .token(TELEGRAM_BOT_TOKEN) \
+            .concurrent_updates(BOT_CONCURRENT_UPDATES) \
+            .build()
+
         # Register the commands
-        self.application.add_handler(CommandHandler("start", self.start_command))
-        self.application.add_handler(CommandHandler("help", self.help_command))
-        self.application.add_handler(CommandHandler("status", self.status_command))
-        self.application.add_handler(CommandHandler("check", self.check_command))
-        self.application.add_handler(CommandHandler("notify", self.notify_command))
+        application.add_handler(CommandHandler("start", self.start_command))
+        application.add_handler(CommandHandler("help", self.help_command))
+        application.add_handler(CommandHandler("status", self.status_command))
+        application.add_handler(CommandHandler("check", self.check_command))
+        application.add_handler(CommandHandler("notify", self.notify_command))
+        application.add_handler(CommandHandler("repeat", self.repeat_command))
+        application.add_handler(CommandHandler("rules", self.rules_command))
+        application.add_handler(CommandHandler("unrepeat", self.unrepeat_command))
+        return application
     
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Manage the /start command"""
@@ -46,7 +74,11 @@ class TelegramBot:
             "/check DD/MM HH:MM - Verificar disponibilidad para una fecha y hora específica\n"
             "Ejemplo: /check 25/03 18:00"
             "/notify DD/MM HH:MM - Deja una suscripción para una fecha y hora específica\n"
-            "Ejemplo: /check 25/03 18:00"
+            "Ejemplo: /check 25/03 18:00\n"
+            "/repeat DIAS HH:MM[-HH:MM] [DD/MM-DD/MM] - Suscripción semanal\n"
+            "Ejemplo: /repeat mar,jue 19:00 o /repeat lun-vie 18:00-21:00 01/04-30/06\n"
+            "/rules - Ver tus suscripciones semanales\n"
+            "/unrepeat ID - Borrar una suscripción semanal"
         )
         await update.message.reply_text(help_text, parse_mode='HTML')
 
@@ -77,15 +109,20 @@ class TelegramBot:
             date_with_year = f"{date_str}/{current_year}"
             
             # Get the available slots
-            available_slots = available_slots_manager.get_available_slots_by_day_and_hour(date_with_year, time_str)
+            with timed('availability_lookup'):
+                available_slots = await db_executor.run(
+                    available_slots_manager.get_available_slots_by_day_and_hour, date_with_year, time_str
+                )
 
             # Notify the user
             if available_slots:
-                message = self.create_message(available_slots)
+                messages = self.create_messages(available_slots)
             else:
-                message = "❌ No hay turnos disponibles para esa fecha y hora."
+                messages = ["❌ No hay turnos disponibles para esa fecha y hora."]
             
-            await update.message.reply_text(message, parse_mode='HTML')
+            with timed('telegram_send'):
+                for message in messages:
+                    await update.message.reply_text(message, parse_mode='HTML')
 
         except Exception as e:
             logger.error(f"Error en el comando check: {str(e)}")
@@ -116,7 +153,7 @@ class TelegramBot:
             date_with_year = f"{date_str}/{current_year}"
 
             # notify to the available slots
-            subscription_manager.add_subscription(date_with_year, time_str, chat_id)
+            await db_executor.run(subscription_manager.add_subscription, date_with_year, time_str, chat_id)
             await update.message.reply_text(
                 f"✅ Te has suscrito al monitoreo de turnos para el {date_str} a las {time_str}."
             )
@@ -133,6 +170,83 @@ class TelegramBot:
                 "Please try again later."
             )
 
+    async def repeat_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Manage the /repeat command"""
+        chat_id = update.effective_chat.id
+        self.chat_ids.add(chat_id)
+
+        usage = (
+            "❌ Formato incorrecto. Por favor usa:\n"
+            "/repeat DIAS HH:MM[-HH:MM] [DD/MM-DD/MM]\n"
+            "Ejemplo: /repeat mar,jue 19:00"
+        )
+        if not context.args or len(context.args) not in (2, 3):
+            await update.message.reply_text(usage)
+            return
+
+        try:
+            weekdays = parse_weekdays(context.args[0])
+            start_hour, end_hour = parse_hour_window(context.args[1])
+            if len(context.args) == 3:
+                start_date, end_date = parse_date_range(context.args[2])
+            else:
+                start_date, end_date = date.today(), None
+
+            # One row for the whole rule, however many dates it covers
+            rule = await db_executor.run(
+                subscription_rule_manager.add_rule,
+                chat_id, weekdays, start_hour, end_hour, start_date, end_date
+            )
+            await update.message.reply_text(f"✅ Suscripción semanal creada: {describe_rule(rule)}")
+        except ValueError as e:
+            await update.message.reply_text(usage)
+        except Exception as e:
+            logger.error(f"Error in the command repeat: {str(e)}")
+            await update.message.reply_text(
+                "❌ An error occurred while processing your subscription.\n"
+                "Please try again later."
+            )
+
+    async def rules_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Manage the /rules command"""
+        try:
+            rules = await db_executor.run(subscription_rule_manager.get_rules, update.effective_chat.id)
+            if rules:
+                message = "🔁 Tus suscripciones semanales:\n" + "\n".join(describe_rule(rule) for rule in rules)
+            else:
+                message = "No tenés suscripciones semanales. Creá una con /repeat."
+            await update.message.reply_text(message)
+        except Exception as e:
+            logger.error(f"Error in the command rules: {str(e)}")
+            await update.message.reply_text(
+                "❌ Ocurrió un error al buscar tus suscripciones.\n"
+                "Por favor, intenta nuevamente más tarde."
+            )
+
+    async def unrepeat_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Manage the /unrepeat command"""
+        if not context.args or len(context.args) != 1 or not context.args[0].lstrip('#').isdigit():
+            await update.message.reply_text(
+                "❌ Formato incorrecto. Por favor usa:\n"
+                "/unrepeat ID\n"
+                "Los IDs se ven con /rules"
+            )
+            return
+
+        try:
+            rule_id = int(context.args[0].lstrip('#'))
+            deleted = await db_executor.run(subscription_rule_manager.delete_rule, rule_id, update.effective_chat.id)
+            if deleted:
+                await update.message.reply_text(f"✅ Suscripción semanal #{rule_id} borrada.")
+            else:
+                await update.message.reply_text(f"❌ No existe la suscripción semanal #{rule_id}.")
+        except Exception as e:
+            logger.error(f"Error in the command unrepeat: {str(e)}")
+            await update.message.reply_text(
+                "❌ Ocurrió un error al borrar la suscripción.\n"
+                "Por favor, intenta nuevamente más tarde."
+            )
+
     async def send_notification(self, message, chat_id):
         """
         Send a message to a specific Telegram chat
@@ -160,14 +274,71 @@ class TelegramBot:
         """
         if not available_slots:
             return
-        message = self.create_message(available_slots)
-        await self.send_notification(message, chat_id)
+        for message in self.create_messages(available_slots):
+            await self.send_notification(message, chat_id)
+
+    def _slot_block(self, slot):
+        lines = [
+            f"📅 <b>Fecha:</b> {slot['fecha']}\n",
+            f"⏰ <b>Hora:</b> {slot['hora']}\n",
+            f"🏸 <b>Cancha:</b> {slot['cancha']}\n",
+        ]
+        venue = slot.get('sede', DEFAULT_VENUE)
+        if venue != DEFAULT_VENUE:
+            lines.append(f"📍 <b>Sede:</b> {venues[venue].name if venue in venues else venue}\n")
+        lines.append("➖➖➖➖➖➖➖➖➖➖\n")
+        return ''.join(lines)
 
     def create_message(self, available_slots):
-        message = "🎾 <b>¡Turnos disponibles encontrados!</b>\n\n"
+        return MESSAGE_HEADER + ''.join(self._slot_block(slot) for slot in available_slots)
+
+    def split_slots(self, available_slots, limit=MESSAGE_LIMIT):
+        """
+        Group slots in as few messages as Telegram's size limit allows.
+        A slot is never split.
+
+        Args:
+            available_slots (list): List of {'fecha', 'hora', 'cancha'} dicts
+            limit (int): Maximum characters per message
+
+        Returns:
+            list: Lists of slots, one per message
+        """
+        groups = []
+        group = []
+        size = len(MESSAGE_HEADER)
         for slot in available_slots:
-            message += f"📅 <b>Fecha:</b> {slot['fecha']}\n"
-            message += f"⏰ <b>Hora:</b> {slot['hora']}\n"
-            message += f"🏸 <b>Cancha:</b> {slot['cancha']}\n"
-            message += "➖➖➖➖➖➖➖➖➖➖\n"
-        return message
\ No newline at end of file
+            block_size = len(self._slot_block(slot))
+            if group and size + block_size > limit:
+                groups.append(group)
+                group, size = [], len(MESSAGE_HEADER)
+            group.append(slot)
+            size += block_size
+        if group:
+            groups.append(group)
+        return groups
+
+    def create_messages(self, available_slots, limit=MESSAGE_LIMIT):
+        """
+        Build the notification for a list of slots, split in as many messages
+        as needed to stay under Telegram's size limit. A slot is never split.
+
+        Args:
+            available_slots (list): List of {'fecha', 'hora', 'cancha'} dicts
+            limit (int): Maximum characters per message
+
+        Returns:
+            list: Messages, each starting with the header
+        """
+        return [self.create_message(group) for group in self.split_slots(available_slots, limit)]
+
+
+@lru_cache(maxsize=None)
+def get_telegram_bot():
+    """
+    Get the TelegramBot of this process, created on first use.
+
+    Returns:
+        TelegramBot: The shared instance
+    """
+    return TelegramBot()
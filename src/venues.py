@@ -0,0 +1,89 @@
+import json
+import os
+
+from src.logger import setup_logger
+from src.database.models.available_slots_model import DEFAULT_VENUE
+from src.config import BASE_URL, CALENDAR_API_URL, CHECK_INTERVAL, VENUES_FILE
+from src.calendar_parser import (
+    DEFAULT_SELECTORS as CALENDAR_SELECTORS, NEXT_DAY_CLASS, DATE_LABEL_SELECTOR
+)
+
+logger = setup_logger(__name__)
+
+# Selectors of the booking page, a venue only needs to list the ones that differ
+DEFAULT_SELECTORS = {
+    **CALENDAR_SELECTORS,
+    'next_day': NEXT_DAY_CLASS,
+    'date_label': DATE_LABEL_SELECTOR,
+}
+
+
+class Venue:
+    """
+    A club whose calendar is scraped.
+
+    Args:
+        slug (str): Identifier stored with the slots and used in queue names
+        url (str): Booking page loaded by the Selenium engine
+        api_url (str, optional): Availability endpoint used by the HTTP engine
+        interval (int, optional): Scrape interval in minutes
+        name (str, optional): Name shown to users
+        selectors (dict, optional): Selectors overriding DEFAULT_SELECTORS
+    """
+
+    def __init__(self, slug, url, api_url='', interval=CHECK_INTERVAL, name=None, selectors=None):
+        self.slug = slug
+        self.url = url
+        self.api_url = api_url
+        self.interval = interval
+        self.name = name or slug
+        self.selectors = {**DEFAULT_SELECTORS, **(selectors or {})}
+
+    @property
+    def queue(self):
+        """Celery queue dedicated to this venue's scrapes"""
+        return f'scrape.{self.slug}'
+
+    def __repr__(self):
+        return f"<Venue(slug='{self.slug}', url='{self.url}', interval={self.interval})>"
+
+
+def load_venues(path=VENUES_FILE):
+    """
+    Load the venue registry.
+
+    The registry is a JSON list of objects with the Venue arguments. When no
+    file is configured, a single default venue is built from BASE_URL.
+
+    Args:
+        path (str): Path to the registry file
+
+    Returns:
+        dict: Venues by slug
+    """
+    if not path or not os.path.exists(path):
+        return {DEFAULT_VENUE: Venue(DEFAULT_VENUE, BASE_URL, api_url=CALENDAR_API_URL)}
+
+    with open(path, encoding='utf-8') as f:
+        venues = [Venue(**entry) for entry in json.load(f)]
+
+    logger.info(f"Loaded {len(venues)} venues from {path}")
+    return {venue.slug: venue for venue in venues}
+
+
+def get_venue(slug=DEFAULT_VENUE):
+    """
+    Returns:
+        Venue: The registered venue
+
+    Raises:
+        KeyError: If the venue is not registered
+    """
+    try:
+        return venues[slug]
+    except KeyError:
+        raise KeyError(f"Unknown venue: {slug}")
+
+
+# Registry loaded once per process
+venues = load_venues()